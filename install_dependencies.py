@@ -4,20 +4,91 @@ Dependency Installation Script for Parking Vision Project
 Attempts to install required packages using different methods
 """
 
+import argparse
+import json
+import re
 import subprocess
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
-def run_command(command):
-    """Run a command and return success status"""
+def _env_int(name, default):
+    """Read a whole number from an environment variable, or use the default"""
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        return int(os.environ.get(name, default))
+    except ValueError:
+        print(f"⚠️  Ignoring {name}={os.environ[name]!r} (not a number), using {default}")
+        return default
+
+
+# Downloads are network-bound, so a handful of workers is plenty
+DEFAULT_PARALLEL_DOWNLOADS = _env_int("PIP_PARALLEL_DOWNLOADS", 4)
+PIP_CACHE_DIR = ".pipcache"
+
+# Remembers which pip command worked so later runs can skip probing
+PIP_PROBE_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "parking_vision", "pip_cmd.json")
+
+# Base pip invocations to try, in order of preference
+PIP_COMMANDS = [
+    [sys.executable, "-m", "pip"],
+    ["pip3"],
+    ["pip"]
+]
+
+
+def run_command(argv):
+    """
+    Run a command and return success status
+
+    Args:
+        argv: Command as a list of arguments, e.g. ["pip3", "--version"]
+    """
+    try:
+        # No shell in between, and close_fds=False lets Python use its fast
+        # posix_spawn/vfork path instead of a full fork of this process
+        result = subprocess.run(argv, capture_output=True, text=True, close_fds=False)
         return result.returncode == 0, result.stdout, result.stderr
     except Exception as e:
         return False, "", str(e)
 
 
+def probe_command(argv, success_re):
+    """
+    Run a command and stop as soon as one output line matches success_re
+
+    Output is read line by line and never kept in memory, and the process
+    is stopped early once the answer is known.
+
+    Args:
+        argv: Command as a list of arguments
+        success_re: Regular expression that marks success
+
+    Returns:
+        True if a line matched, False otherwise
+    """
+    pattern = re.compile(success_re)
+    try:
+        process = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, bufsize=1, close_fds=False)
+    except OSError:
+        return False  # Command not installed
+
+    matched = False
+    try:
+        for line in process.stdout:
+            if pattern.search(line):
+                matched = True
+                break
+    finally:
+        if process.poll() is None:
+            process.terminate()
+        process.stdout.close()
+        process.wait()
+
+    return matched
+
+
 def check_python():
     """Check Python version and available package managers"""
     print("🐍 Checking Python installation...")
@@ -32,26 +103,131 @@ def check_python():
         print("   ✅ Python version OK")
 
     # Check for pip
-    success, _, _ = run_command("python3 -m pip --version")
-    if success:
-        print("   ✅ pip available via python3 -m pip")
-        return True
+    pip_cmd = _cached_pip_cmd()
+    if pip_cmd:
+        print(f"   ✅ pip available via {' '.join(pip_cmd)}")
+        return pip_cmd
 
-    success, _, _ = run_command("pip3 --version")
-    if success:
-        print("   ✅ pip3 available")
-        return True
+    print("   ❌ pip not found")
+    return None
 
-    success, _, _ = run_command("pip --version")
-    if success:
-        print("   ✅ pip available")
-        return True
 
-    print("   ❌ pip not found")
-    return False
+def _cached_pip_cmd():
+    """
+    Find a working pip command, remembering the answer between runs
+
+    The result is stored in ~/.cache/parking_vision/pip_cmd.json together with
+    the Python interpreter's modification time, so it is probed again whenever
+    Python is reinstalled or upgraded.
+
+    Returns:
+        Working pip command as a list of arguments, or None if pip could not be found
+    """
+    try:
+        python_mtime = os.path.getmtime(sys.executable)
+    except OSError:
+        python_mtime = None
+
+    try:
+        with open(PIP_PROBE_CACHE) as f:
+            cached = json.load(f)
+        if (cached.get("python") == sys.executable
+                and cached.get("mtime") == python_mtime
+                and isinstance(cached.get("cmd"), list)):
+            return cached["cmd"]
+    except (OSError, ValueError):
+        pass  # No usable cache yet
+
+    for pip_cmd in PIP_COMMANDS:
+        if probe_command([*pip_cmd, "--version"], r"^pip \d"):
+            break
+    else:
+        return None
+
+    # Write to a temp file first so a crash never leaves half a JSON file behind
+    try:
+        os.makedirs(os.path.dirname(PIP_PROBE_CACHE), exist_ok=True)
+        temp_path = PIP_PROBE_CACHE + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"python": sys.executable, "mtime": python_mtime, "cmd": pip_cmd}, f)
+        os.replace(temp_path, PIP_PROBE_CACHE)
+    except OSError:
+        pass  # Caching is only an optimization
+
+    return pip_cmd
+
+
+def read_requirements(path="requirements.txt"):
+    """Read package specs from a requirements file, skipping comments"""
+    packages = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                packages.append(line)
+    return packages
+
+
+def download_packages(pip_cmd, packages, parallel_downloads=DEFAULT_PARALLEL_DOWNLOADS):
+    """
+    Download packages (and their dependencies) into .pipcache
+
+    The packages themselves are downloaded in parallel, without their
+    dependencies, so shared dependencies (numpy, torch...) are never fetched
+    several times at once. One more pip download then adds the missing
+    dependencies - pip skips every file that is already in .pipcache.
+
+    Returns:
+        True if everything downloaded, False otherwise
+    """
+    print(f"   Downloading {len(packages)} packages with {parallel_downloads} workers...")
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=max(1, parallel_downloads)) as executor:
+        futures = {}
+        for package in packages:
+            command = [*pip_cmd, "download", "--no-deps", "--dest", PIP_CACHE_DIR, package]
+            futures[executor.submit(run_command, command)] = package
+
+        for future in as_completed(futures):
+            package = futures[future]
+            success, _, stderr = future.result()
+            if success:
+                print(f"   ✅ Downloaded {package}")
+            else:
+                print(f"   ❌ Could not download {package}: {stderr}")
+                failed = True
+
+    if failed:
+        return False
+
+    print("   Downloading dependencies...")
+    success, _, stderr = run_command([*pip_cmd, "download", "--dest", PIP_CACHE_DIR, *packages])
+    if not success:
+        print(f"   ❌ Could not download dependencies: {stderr}")
+    return success
+
+
+def install_packages(pip_cmd, packages, parallel_downloads=DEFAULT_PARALLEL_DOWNLOADS):
+    """
+    Install packages using one pip command
+
+    Downloads happen in parallel first, then a single offline install
+    runs from the local cache (pip installs are not safe to run side by side).
+    Falls back to a plain online install if any download fails.
+    """
+    if download_packages(pip_cmd, packages, parallel_downloads):
+        success, stdout, stderr = run_command(
+            [*pip_cmd, "install", "--user", "--no-index", "--find-links", PIP_CACHE_DIR, *packages]
+        )
+        if success:
+            return True, stdout, stderr
+        print("   ⚠️  Offline install from cache failed, installing directly...")
+
+    return run_command([*pip_cmd, "install", "--user", *packages])
 
 
-def install_basic_packages():
+def install_basic_packages(parallel_downloads=DEFAULT_PARALLEL_DOWNLOADS):
     """Install basic packages that are likely to work"""
     basic_packages = [
         "opencv-python",
@@ -64,15 +240,9 @@ def install_basic_packages():
 
     print(f"\n📦 Attempting to install basic packages...")
 
-    pip_commands = [
-        "python3 -m pip install --user",
-        "pip3 install --user",
-        "pip install --user"
-    ]
-
-    for pip_cmd in pip_commands:
-        print(f"   Trying: {pip_cmd}")
-        success, stdout, stderr = run_command(f"{pip_cmd} {' '.join(basic_packages)}")
+    for pip_cmd in PIP_COMMANDS:
+        print(f"   Trying: {' '.join(pip_cmd)}")
+        success, stdout, stderr = install_packages(pip_cmd, basic_packages, parallel_downloads)
 
         if success:
             print("   ✅ Basic packages installed successfully!")
@@ -109,6 +279,12 @@ PyYAML
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Install Parking Vision dependencies")
+    parser.add_argument("--parallel-downloads", type=int, default=DEFAULT_PARALLEL_DOWNLOADS,
+                        help="Number of packages to download at the same time "
+                             "(default: $PIP_PARALLEL_DOWNLOADS or 4)")
+    args = parser.parse_args()
+
     print("🚗 Parking Vision Project - Dependency Installation")
     print("=" * 50)
 
@@ -118,7 +294,8 @@ def main():
         return
 
     # Check Python installation
-    if not check_python():
+    pip_cmd = check_python()
+    if not pip_cmd:
         print("\n❌ pip not available. Please install pip first:")
         print("   Ubuntu/Debian: sudo apt install python3-pip")
         print("   Or follow: https://pip.pypa.io/en/stable/installation/")
@@ -127,16 +304,15 @@ def main():
     # Try to install packages
     print(f"\n📦 Installing packages from requirements.txt...")
 
-    pip_commands = [
-        "python3 -m pip install --user -r requirements.txt",
-        "pip3 install --user -r requirements.txt",
-        "pip install --user -r requirements.txt"
-    ]
+    requirements = read_requirements("requirements.txt")
+
+    # Try the pip command we know works first
+    pip_commands = [pip_cmd] + [cmd for cmd in PIP_COMMANDS if cmd != pip_cmd]
 
     installed = False
     for pip_cmd in pip_commands:
-        print(f"   Trying: {pip_cmd}")
-        success, stdout, stderr = run_command(pip_cmd)
+        print(f"   Trying: {' '.join(pip_cmd)}")
+        success, stdout, stderr = install_packages(pip_cmd, requirements, args.parallel_downloads)
 
         if success:
             print("   ✅ All packages installed successfully!")
@@ -147,7 +323,7 @@ def main():
 
     if not installed:
         print(f"\n⚠️  Full installation failed. Trying basic packages...")
-        if install_basic_packages():
+        if install_basic_packages(args.parallel_downloads):
             create_requirements_minimal()
             print(f"\n✅ Basic installation complete!")
             print(f"   You can manually install additional packages later")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Geometry Helpers for Parking Spot Checks
+Fast point-in-polygon tests used to decide which cars and cones are inside which spots.
+"""
+
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Columns of an edge table (see polygon_edges)
+EDGE_Y1, EDGE_Y2, EDGE_A, EDGE_B, EDGE_C = range(5)
+
+
+def polygon_edges(px: np.ndarray, py: np.ndarray) -> np.ndarray:
+    """
+    Precompute everything the point-in-polygon test needs for each edge
+
+    Edge k runs from vertex k-1 to vertex k. A ray going right from (x, y)
+    crosses it when y1 >= y differs from y2 >= y (the edge spans the point's
+    height) and x * a - y * b <= c (the point is left of the edge or on it).
+    a, b and c are the edge's line equation, flipped so the test always
+    reads "<=" - no division and no per-point sign check.
+
+    Args:
+        px, py: Polygon vertex coordinates
+
+    Returns:
+        (N, 5) float64 array of [y1, y2, a, b, c] rows
+    """
+    px = np.asarray(px, dtype=np.float64)
+    py = np.asarray(py, dtype=np.float64)
+    x1, y1 = np.roll(px, 1), np.roll(py, 1)
+    x2, y2 = px, py
+
+    dx = x2 - x1
+    dy = y2 - y1
+    sign = np.where(dy < 0, -1.0, 1.0)
+
+    edges = np.empty((len(px), 5), dtype=np.float64)
+    edges[:, EDGE_Y1] = y1
+    edges[:, EDGE_Y2] = y2
+    edges[:, EDGE_A] = dy * sign
+    edges[:, EDGE_B] = dx * sign
+    edges[:, EDGE_C] = (x1 * dy - y1 * dx) * sign
+    return edges
+
+
+def _points_in_edges_numpy(xs: np.ndarray, ys: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Ray casting with NumPy: every point against every polygon edge at once
+    (used when Numba is not installed)
+    """
+    x = xs[:, None]
+    y = ys[:, None]
+
+    # Does a ray going right from the point cross each edge?
+    crosses = ((edges[:, EDGE_Y1] >= y) != (edges[:, EDGE_Y2] >= y)) & \
+        (x * edges[:, EDGE_A] - y * edges[:, EDGE_B] <= edges[:, EDGE_C])
+
+    # Odd number of crossings = inside
+    return np.bitwise_xor.reduce(crosses, axis=1)
+
+
+def pack_polygons(polygons) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack the edge tables of many polygons into one array
+
+    Polygon i's edges are edges[offsets[i]:offsets[i + 1]].
+
+    Args:
+        polygons: List of (N, 2) vertex arrays
+
+    Returns:
+        (edges, offsets) - (E, 5) float64 edge table and int64 offsets
+    """
+    offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(p) for p in polygons])
+    if len(polygons) == 0:
+        return np.zeros((0, 5)), offsets
+    points = [np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in polygons]
+    edges = np.concatenate([polygon_edges(p[:, 0], p[:, 1]) for p in points])
+    return edges, offsets
+
+
+def _spot_occupancy_numpy(xs, ys, confidences, edges, offsets, boxes):
+    """
+    NumPy version of spot_occupancy (used when Numba is not installed)
+    """
+    n_spots = len(offsets) - 1
+    occupied = np.zeros(n_spots, dtype=bool)
+    max_confidence = np.zeros(n_spots, dtype=np.float64)
+
+    # Quick rejection: which centers are inside each spot's bounding box?
+    # (one array operation for all spots; usually only a few pairs survive)
+    x = xs[:, None]
+    y = ys[:, None]
+    in_box = (x >= boxes[:, 0]) & (y >= boxes[:, 1]) & (x <= boxes[:, 2]) & (y <= boxes[:, 3])
+
+    # Only spots with a center in their bounding box can be occupied
+    for i in np.flatnonzero(in_box.any(axis=0)):
+        candidates = np.flatnonzero(in_box[:, i])
+        spot_edges = edges[offsets[i]:offsets[i + 1]]
+        candidates = candidates[_points_in_edges_numpy(xs[candidates], ys[candidates], spot_edges)]
+        if len(candidates) > 0:
+            occupied[i] = True
+            max_confidence[i] = confidences[candidates].max()
+
+    return occupied, max_confidence
+
+
+if NUMBA_AVAILABLE:
+    # The kernels below are compiled for fixed argument types when this module
+    # is imported (and cached on disk), so the first video frame doesn't pay
+    # for compilation. nogil lets other threads run while they work.
+
+    @njit("boolean(float64, float64, float64[:, :])", cache=True, nogil=True)
+    def pip(x, y, edges):
+        """
+        Check if one point is inside a polygon (ray casting, compiled by Numba)
+
+        Franklin's PNPOLY on a precomputed edge table: each crossed edge flips
+        the result, with no division and no branches for the CPU to mispredict.
+
+        Args:
+            x, y: Point coordinates
+            edges: Edge table from polygon_edges()
+
+        Returns:
+            True if the point is inside the polygon
+        """
+        inside = False
+        for k in range(edges.shape[0]):
+            inside ^= ((edges[k, 0] >= y) != (edges[k, 1] >= y)) & \
+                (x * edges[k, 2] - y * edges[k, 3] <= edges[k, 4])
+        return inside
+
+    @njit("boolean(float64, float64, float64[:, :], int64)", cache=True, nogil=True)
+    def pip_quad(x, y, edges, first):
+        """
+        pip() written out for a four-corner spot (the usual parking spot shape)
+
+        With the loop unrolled the compiler sees straight-line code: four edge
+        tests and three XORs, no loop counter and no bounds to check.
+
+        Args:
+            x, y: Point coordinates
+            edges: Packed edge table from pack_polygons()
+            first: Row of the spot's first edge in edges
+
+        Returns:
+            True if the point is inside the spot
+        """
+        e0 = first
+        e1 = first + 1
+        e2 = first + 2
+        e3 = first + 3
+        c0 = ((edges[e0, 0] >= y) != (edges[e0, 1] >= y)) & \
+            (x * edges[e0, 2] - y * edges[e0, 3] <= edges[e0, 4])
+        c1 = ((edges[e1, 0] >= y) != (edges[e1, 1] >= y)) & \
+            (x * edges[e1, 2] - y * edges[e1, 3] <= edges[e1, 4])
+        c2 = ((edges[e2, 0] >= y) != (edges[e2, 1] >= y)) & \
+            (x * edges[e2, 2] - y * edges[e2, 3] <= edges[e2, 4])
+        c3 = ((edges[e3, 0] >= y) != (edges[e3, 1] >= y)) & \
+            (x * edges[e3, 2] - y * edges[e3, 3] <= edges[e3, 4])
+        return c0 ^ c1 ^ c2 ^ c3
+
+    @njit("Tuple((boolean[:], float64[:]))(float64[:], float64[:], float64[:], "
+          "float64[:, :], int64[:], float64[:, :])", cache=True, nogil=True)
+    def _spot_occupancy_numba(xs, ys, confidences, edges, offsets, boxes):
+        """
+        Compiled version of spot_occupancy - one loop over spots and centers
+        """
+        n_spots = len(offsets) - 1
+        occupied = np.zeros(n_spots, dtype=np.bool_)
+        max_confidence = np.zeros(n_spots, dtype=np.float64)
+        for i in range(n_spots):
+            first = offsets[i]
+            spot_edges = edges[first:offsets[i + 1]]
+            is_quad = len(spot_edges) == 4
+            for k in range(len(xs)):
+                x = xs[k]
+                y = ys[k]
+                # Quick rejection with the spot's bounding box first
+                if x < boxes[i, 0] or y < boxes[i, 1] or x > boxes[i, 2] or y > boxes[i, 3]:
+                    continue
+                # Four-corner spots use the unrolled version
+                if pip_quad(x, y, edges, first) if is_quad else pip(x, y, spot_edges):
+                    occupied[i] = True
+                    if confidences[k] > max_confidence[i]:
+                        max_confidence[i] = confidences[k]
+        return occupied, max_confidence
+
+
+def spot_occupancy(xs: np.ndarray, ys: np.ndarray, confidences: np.ndarray,
+                   edges: np.ndarray, offsets: np.ndarray,
+                   boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Check all car/cone centers against all parking spots in one call
+
+    Args:
+        xs, ys: Center coordinates (float64 arrays)
+        confidences: Confidence of each center (float64 array)
+        edges, offsets: Packed spot edge tables from pack_polygons()
+        boxes: Bounding box of every spot, (S, 4) float64 array of
+            (xmin, ymin, xmax, ymax)
+
+    Returns:
+        (occupied, max_confidence) - one entry per spot
+    """
+    if NUMBA_AVAILABLE:
+        return _spot_occupancy_numba(xs, ys, confidences, edges, offsets, boxes)
+    return _spot_occupancy_numpy(xs, ys, confidences, edges, offsets, boxes)
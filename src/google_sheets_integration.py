@@ -4,35 +4,140 @@ Google Sheets Integration for Parking Lot Data
 Uploads parking occupancy data to Google Sheets for real-time monitoring.
 """
 
+import atexit
+import importlib.util
 import json
 import os
 import time
+import weakref
+from collections import namedtuple
 from datetime import datetime
 from typing import Dict, List, Optional
 import logging
 
-try:
-    import gspread
-    from google.oauth2.service_account import Credentials
-    SHEETS_AVAILABLE = True
-except ImportError:
-    SHEETS_AVAILABLE = False
-    print("⚠️  Google Sheets integration not available. Install with: pip install gspread google-auth")
+import numpy as np
+
+# Whether gspread/google-auth are installed - checked on first use rather than
+# at import time, so the local-file (mock) integration never pays for loading them
+_SHEETS_AVAILABLE = None
+
+# Authorized clients shared by every instance, keyed by (credentials path, file mtime)
+_CLIENT_CACHE = {}
+
+# Integrations whose buffered history rows are written when the program exits
+# (weak references, so this doesn't keep integrations alive)
+_INTEGRATIONS = weakref.WeakSet()
+
+
+def _flush_all() -> None:
+    """Write the buffered history rows of every integration still alive"""
+    for integration in list(_INTEGRATIONS):
+        integration.flush()
+
+
+atexit.register(_flush_all)
+
+
+def sheets_available() -> bool:
+    """
+    Check whether the Google Sheets libraries are installed (only looks them
+    up, once - they are imported when authenticating)
+
+    Returns:
+        True if gspread and google-auth can be imported
+    """
+    global _SHEETS_AVAILABLE
+    if _SHEETS_AVAILABLE is None:
+        try:
+            _SHEETS_AVAILABLE = (importlib.util.find_spec('gspread') is not None
+                                 and importlib.util.find_spec('google.oauth2') is not None)
+        except ImportError:
+            _SHEETS_AVAILABLE = False  # Not even the google package is installed
+        if not _SHEETS_AVAILABLE:
+            print("⚠️  Google Sheets integration not available. Install with: pip install gspread google-auth")
+    return _SHEETS_AVAILABLE
+
+
+# Spot data stored as one array per field ("struct of arrays") instead of a dict per spot
+SpotTable = namedtuple("SpotTable", "ids types occupied confidences last_detection_times points")
+
+
+def make_spot_table(spots: List[Dict]) -> SpotTable:
+    """
+    Convert a list of spot dictionaries into a SpotTable
+
+    Args:
+        spots: List of spot dictionaries (as saved by the parking monitor)
+
+    Returns:
+        SpotTable with one entry per spot
+    """
+    return SpotTable(
+        ids=[spot.get('id', '') for spot in spots],
+        types=np.array([spot.get('type', 'normal') for spot in spots], dtype=str),
+        occupied=np.array([bool(spot.get('occupied', False)) for spot in spots], dtype=bool),
+        confidences=np.array([spot.get('confidence', 0) for spot in spots], dtype=np.float64),
+        last_detection_times=np.array([spot.get('last_detection_time', 0) for spot in spots],
+                                      dtype=np.float64),
+        points=[spot.get('points') for spot in spots],
+    )
+
+
+def polygon_geometry(polygons: List[List]) -> List[tuple]:
+    """
+    Calculate center and area for a list of spot polygons
+
+    Args:
+        polygons: List of polygons, each a list of (x, y) points
+
+    Returns:
+        List of (center_x, center_y, area) tuples, one per polygon
+    """
+    if not polygons:
+        return []
+
+    # Same number of corners everywhere (the usual case): one array for all spots
+    if len({len(p) for p in polygons}) == 1:
+        groups = [np.asarray(polygons, dtype=np.float64)]
+    else:
+        groups = [np.asarray(p, dtype=np.float64)[None] for p in polygons]
+
+    results = []
+    for pts in groups:
+        centers = pts.mean(axis=1).astype(int)
+        # Shoelace formula for polygon area
+        x, y = pts[..., 0], pts[..., 1]
+        areas = 0.5 * np.abs((x * np.roll(y, -1, axis=1)).sum(axis=1)
+                             - (y * np.roll(x, -1, axis=1)).sum(axis=1))
+        results.extend(zip(centers[:, 0].tolist(), centers[:, 1].tolist(),
+                           areas.astype(int).tolist()))
+    return results
 
 
 class GoogleSheetsIntegration:
-    def __init__(self, credentials_path: str = "credentials/service_account.json"):
+    def __init__(self, credentials_path: str = "credentials/service_account.json",
+                 history_flush_every: int = 20):
         """
         Initialize Google Sheets integration
 
         Args:
             credentials_path: Path to service account JSON credentials
+            history_flush_every: Number of history rows to collect before writing them
         """
         self.credentials_path = credentials_path
         self.client = None
         self.worksheet = None
         self.spreadsheet_id = None
 
+        # Cached API handles (each fetch is a round-trip to Google)
+        self._spreadsheet = None
+        self._worksheets = {}
+
+        # History rows waiting to be written in one request (see flush())
+        self._history_buffer = []
+        self.history_flush_every = history_flush_every
+        _INTEGRATIONS.add(self)
+
         # Setup logging
         self.logger = logging.getLogger(__name__)
 
@@ -49,20 +154,30 @@ class GoogleSheetsIntegration:
         Returns:
             True if successful, False otherwise
         """
-        if not SHEETS_AVAILABLE:
+        if not sheets_available():
             self.logger.error("Google Sheets libraries not available")
             return False
 
+        import gspread
+        from google.oauth2.service_account import Credentials
+
         if not os.path.exists(self.credentials_path):
             self.logger.error(f"Credentials file not found: {self.credentials_path}")
             self.logger.info("Please download service account credentials from Google Cloud Console")
             return False
 
         try:
+            # Reuse the client if these credentials were already loaded (and not changed since)
+            cache_key = (os.path.abspath(self.credentials_path), os.path.getmtime(self.credentials_path))
+            if cache_key in _CLIENT_CACHE:
+                self.client = _CLIENT_CACHE[cache_key]
+                return True
+
             credentials = Credentials.from_service_account_file(
                 self.credentials_path, scopes=self.scopes
             )
             self.client = gspread.authorize(credentials)
+            _CLIENT_CACHE[cache_key] = self.client
             self.logger.info("✅ Google Sheets authentication successful")
             return True
 
@@ -87,6 +202,8 @@ class GoogleSheetsIntegration:
         try:
             spreadsheet = self.client.create(title)
             self.spreadsheet_id = spreadsheet.id
+            self._spreadsheet = spreadsheet
+            self._worksheets = {}
 
             # Share with your email (replace with your email)
             # spreadsheet.share('your-email@gmail.com', perm_type='user', role='writer')
@@ -120,6 +237,8 @@ class GoogleSheetsIntegration:
         try:
             spreadsheet = self.client.open_by_key(spreadsheet_id)
             self.spreadsheet_id = spreadsheet_id
+            self._spreadsheet = spreadsheet
+            self._worksheets = {}
             self.logger.info(f"✅ Opened spreadsheet: {spreadsheet.title}")
             return True
 
@@ -127,6 +246,26 @@ class GoogleSheetsIntegration:
             self.logger.error(f"Error opening spreadsheet: {str(e)}")
             return False
 
+    def _get_spreadsheet(self):
+        """
+        Get the open spreadsheet, fetching it only once
+        """
+        if self._spreadsheet is None:
+            self._spreadsheet = self.client.open_by_key(self.spreadsheet_id)
+            self._worksheets = {}
+        return self._spreadsheet
+
+    def _get_ws(self, name: str):
+        """
+        Get a worksheet by title, fetching it only once
+
+        Args:
+            name: Worksheet title
+        """
+        if name not in self._worksheets:
+            self._worksheets[name] = self._get_spreadsheet().worksheet(name)
+        return self._worksheets[name]
+
     def setup_worksheets(self) -> None:
         """
         Setup initial worksheet structure
@@ -135,53 +274,68 @@ class GoogleSheetsIntegration:
             return
 
         try:
-            spreadsheet = self.client.open_by_key(self.spreadsheet_id)
+            spreadsheet = self._get_spreadsheet()
 
-            # Rename default sheet to "Current Status"
-            sheet1 = spreadsheet.sheet1
-            sheet1.update_title("Current Status")
+            # One listing call tells us which sheets already exist
+            existing = {worksheet.title: worksheet for worksheet in spreadsheet.worksheets()}
+            self._worksheets.update(existing)
 
-            # Add headers for current status
-            headers = [
-                "Timestamp", "Total Spots", "Available", "Occupied",
-                "Occupancy Rate (%)", "Normal Available", "Electric Available",
-                "Reserved Available", "Last Update"
-            ]
-            sheet1.append_row(headers)
+            # Rename default sheet to "Current Status"
+            if "Current Status" not in existing:
+                sheet1 = spreadsheet.sheet1
+                sheet1.update_title("Current Status")
+                self._worksheets["Current Status"] = sheet1
+
+            # Headers for current status
+            headers = {
+                "Current Status": [
+                    "Timestamp", "Total Spots", "Available", "Occupied",
+                    "Occupancy Rate (%)", "Normal Available", "Electric Available",
+                    "Reserved Available", "Last Update"
+                ]
+            }
 
             # Create "Spot Details" worksheet
-            try:
-                details_sheet = spreadsheet.add_worksheet(title="Spot Details", rows=100, cols=10)
-                detail_headers = [
+            if "Spot Details" not in existing:
+                self._worksheets["Spot Details"] = spreadsheet.add_worksheet(
+                    title="Spot Details", rows=100, cols=10
+                )
+                headers["Spot Details"] = [
                     "Spot ID", "Type", "Status", "Confidence", "Last Occupied",
                     "X Coordinate", "Y Coordinate", "Area", "Notes", "Timestamp"
                 ]
-                details_sheet.append_row(detail_headers)
-            except:
-                pass  # Sheet might already exist
 
             # Create "Historical Data" worksheet
-            try:
-                history_sheet = spreadsheet.add_worksheet(title="Historical Data", rows=1000, cols=8)
-                history_headers = [
+            if "Historical Data" not in existing:
+                self._worksheets["Historical Data"] = spreadsheet.add_worksheet(
+                    title="Historical Data", rows=1000, cols=8
+                )
+                headers["Historical Data"] = [
                     "Timestamp", "Total Spots", "Available", "Occupied",
                     "Occupancy Rate (%)", "Peak Hour", "Weather", "Notes"
                 ]
-                history_sheet.append_row(history_headers)
-            except:
-                pass  # Sheet might already exist
+
+            # Write all header rows in a single request
+            spreadsheet.values_batch_update({
+                "valueInputOption": "RAW",
+                "data": [
+                    {"range": f"'{title}'!A1", "values": [row]}
+                    for title, row in headers.items()
+                ]
+            })
 
             self.logger.info("✅ Worksheet structure setup complete")
 
         except Exception as e:
             self.logger.error(f"Error setting up worksheets: {str(e)}")
 
-    def upload_current_status(self, occupancy_data: Dict) -> bool:
+    def upload_current_status(self, occupancy_data: Dict, spot_table: Optional[SpotTable] = None) -> bool:
         """
         Upload current parking status to Google Sheets
 
         Args:
             occupancy_data: Dictionary containing parking occupancy data
+            spot_table: Spots as a SpotTable (built from occupancy_data if not given)
 
         Returns:
             True if successful, False otherwise
@@ -191,8 +345,7 @@ class GoogleSheetsIntegration:
             return False
 
         try:
-            spreadsheet = self.client.open_by_key(self.spreadsheet_id)
-            current_sheet = spreadsheet.worksheet("Current Status")
+            current_sheet = self._get_ws("Current Status")
 
             # Prepare data row
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -202,10 +355,13 @@ class GoogleSheetsIntegration:
             occupancy_rate = occupancy_data.get('occupancy_rate', 0)
 
             # Count by type
-            spots = occupancy_data.get('spots', [])
-            normal_available = sum(1 for s in spots if s.get('type') == 'normal' and not s.get('occupied'))
-            electric_available = sum(1 for s in spots if s.get('type') == 'electric' and not s.get('occupied'))
-            reserved_available = sum(1 for s in spots if s.get('type') == 'reserved' and not s.get('occupied'))
+            if spot_table is None:
+                spot_table = make_spot_table(occupancy_data.get('spots', []))
+            free = ~spot_table.occupied
+            available_by_type = {
+                spot_type: int(((spot_table.types == spot_type) & free).sum())
+                for spot_type in ('normal', 'electric', 'reserved')
+            }
 
             row_data = [
                 timestamp,
@@ -213,52 +369,77 @@ class GoogleSheetsIntegration:
                 available,
                 occupied,
                 round(occupancy_rate, 2),
-                normal_available,
-                electric_available,
-                reserved_available,
+                available_by_type['normal'],
+                available_by_type['electric'],
+                available_by_type['reserved'],
                 datetime.now().strftime("%H:%M:%S")
             ]
 
-            # Clear existing data and add new row (keep only latest status)
-            current_sheet.clear()
+            # Overwrite headers + latest status in one request (keep only latest status)
             headers = [
                 "Timestamp", "Total Spots", "Available", "Occupied",
                 "Occupancy Rate (%)", "Normal Available", "Electric Available",
                 "Reserved Available", "Last Update"
             ]
-            current_sheet.append_row(headers)
-            current_sheet.append_row(row_data)
-
-            # Also append to historical data
-            try:
-                history_sheet = spreadsheet.worksheet("Historical Data")
-                history_row = [
-                    timestamp,
-                    total_spots,
-                    available,
-                    occupied,
-                    round(occupancy_rate, 2),
-                    "",  # Peak hour - can be calculated later
-                    "",  # Weather - can be added from external API
-                    ""   # Notes
-                ]
-                history_sheet.append_row(history_row)
-            except:
-                pass  # History sheet might not exist
+            current_sheet.update(range_name="A1:I2", values=[headers, row_data],
+                                 value_input_option="RAW")
+
+            # Also add to historical data (written in batches, see flush())
+            self._history_buffer.append([
+                timestamp,
+                total_spots,
+                available,
+                occupied,
+                round(occupancy_rate, 2),
+                "",  # Peak hour - can be calculated later
+                "",  # Weather - can be added from external API
+                ""   # Notes
+            ])
+            if len(self._history_buffer) >= self.history_flush_every:
+                self.flush()
 
             self.logger.info(f"✅ Status uploaded to Google Sheets: {available}/{total_spots} available")
             return True
 
         except Exception as e:
             self.logger.error(f"Error uploading current status: {str(e)}")
+            self._worksheets = {}  # Re-fetch handles next time in case a sheet changed
+            return False
+
+    def flush(self) -> bool:
+        """
+        Write all buffered history rows to the "Historical Data" sheet in one request
+        (also runs automatically when the program exits)
+
+        Returns:
+            True if successful (or nothing to write), False otherwise
+        """
+        if not self._history_buffer:
+            return True
+
+        if not self.client or not self.spreadsheet_id:
             return False
 
-    def upload_spot_details(self, occupancy_data: Dict) -> bool:
+        try:
+            history_sheet = self._get_ws("Historical Data")
+            history_sheet.append_rows(self._history_buffer, value_input_option="RAW")
+            self._history_buffer.clear()
+            return True
+
+        except Exception as e:
+            # Keep the newest rows so the next flush can try again
+            self.logger.error(f"Error writing historical data: {str(e)}")
+            del self._history_buffer[:-1000]
+            self._worksheets.pop("Historical Data", None)
+            return False
+
+    def upload_spot_details(self, occupancy_data: Dict, spot_table: Optional[SpotTable] = None) -> bool:
         """
         Upload detailed spot information to Google Sheets
 
         Args:
             occupancy_data: Dictionary containing parking occupancy data
+            spot_table: Spots as a SpotTable (built from occupancy_data if not given)
 
         Returns:
             True if successful, False otherwise
@@ -268,60 +449,65 @@ class GoogleSheetsIntegration:
             return False
 
         try:
-            spreadsheet = self.client.open_by_key(self.spreadsheet_id)
-            details_sheet = spreadsheet.worksheet("Spot Details")
-
-            # Clear existing data
-            details_sheet.clear()
+            details_sheet = self._get_ws("Spot Details")
 
-            # Add headers
             headers = [
                 "Spot ID", "Type", "Status", "Confidence", "Last Occupied",
                 "X Coordinate", "Y Coordinate", "Area", "Notes", "Timestamp"
             ]
-            details_sheet.append_row(headers)
+            rows = [headers]
 
-            # Add spot data
-            spots = occupancy_data.get('spots', [])
+            # Build spot data
+            if spot_table is None:
+                spot_table = make_spot_table(occupancy_data.get('spots', []))
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            for spot in spots:
-                # Calculate center coordinates (simplified)
+            # Calculate center coordinates and area for all spots at once
+            has_points = [p is not None and len(p) > 0 for p in spot_table.points]
+            geometry = iter(polygon_geometry([p for p, ok in zip(spot_table.points, has_points) if ok]))
+
+            # Work out per-column values with whole-array operations
+            types = np.char.upper(spot_table.types).tolist()
+            statuses = np.where(spot_table.occupied, "OCCUPIED", "AVAILABLE").tolist()
+            confidences = np.round(spot_table.confidences, 3).tolist()
+            last_times = spot_table.last_detection_times.tolist()
+
+            for i in range(len(spot_table.ids)):
                 center_x = center_y = area = ""
-                if 'points' in spot:
-                    points = spot['points']
-                    center_x = int(sum(p[0] for p in points) / len(points))
-                    center_y = int(sum(p[1] for p in points) / len(points))
-                    # Approximate area calculation
-                    area = len(points) * 100  # Simplified
-
-                status = "OCCUPIED" if spot.get('occupied', False) else "AVAILABLE"
-                confidence = spot.get('confidence', 0)
+                if has_points[i]:
+                    center_x, center_y, area = next(geometry)
+
                 last_occupied = ""
-                if spot.get('last_detection_time', 0) > 0:
-                    last_occupied = datetime.fromtimestamp(
-                        spot['last_detection_time']
-                    ).strftime("%H:%M:%S")
-
-                row_data = [
-                    spot.get('id', ''),
-                    spot.get('type', 'normal').upper(),
-                    status,
-                    round(confidence, 3) if confidence > 0 else "",
+                if last_times[i] > 0:
+                    last_occupied = datetime.fromtimestamp(last_times[i]).strftime("%H:%M:%S")
+
+                rows.append([
+                    spot_table.ids[i],
+                    types[i],
+                    statuses[i],
+                    confidences[i] if confidences[i] > 0 else "",
                     last_occupied,
                     center_x,
                     center_y,
                     area,
                     "",  # Notes
                     timestamp
-                ]
-                details_sheet.append_row(row_data)
+                ])
+
+            # Unlike append_row, update() does not grow the sheet by itself
+            if len(rows) > details_sheet.row_count:
+                details_sheet.add_rows(len(rows) - details_sheet.row_count)
+
+            # Clear old data and write everything in two requests instead of one per spot
+            details_sheet.batch_clear(["A:J"])
+            details_sheet.update(range_name="A1", values=rows, value_input_option="RAW")
 
-            self.logger.info(f"✅ Uploaded details for {len(spots)} parking spots")
+            self.logger.info(f"✅ Uploaded details for {len(spot_table.ids)} parking spots")
             return True
 
         except Exception as e:
             self.logger.error(f"Error uploading spot details: {str(e)}")
+            self._worksheets = {}  # Re-fetch handles next time in case a sheet changed
             return False
 
     def create_dashboard_formulas(self) -> None:
@@ -332,8 +518,7 @@ class GoogleSheetsIntegration:
             return
 
         try:
-            spreadsheet = self.client.open_by_key(self.spreadsheet_id)
-            current_sheet = spreadsheet.worksheet("Current Status")
+            current_sheet = self._get_ws("Current Status")
 
             # Add some useful formulas and formatting
             # This would typically include charts and conditional formatting
@@ -367,7 +552,10 @@ class MockGoogleSheetsIntegration:
     def open_spreadsheet(self, spreadsheet_id: str) -> bool:
         return True
 
-    def upload_current_status(self, occupancy_data: Dict) -> bool:
+    def flush(self) -> bool:
+        return True
+
+    def upload_current_status(self, occupancy_data: Dict, spot_table: Optional[SpotTable] = None) -> bool:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = os.path.join(self.output_dir, f"current_status_{timestamp}.json")
 
@@ -382,7 +570,7 @@ class MockGoogleSheetsIntegration:
             self.logger.error(f"Error saving status: {str(e)}")
             return False
 
-    def upload_spot_details(self, occupancy_data: Dict) -> bool:
+    def upload_spot_details(self, occupancy_data: Dict, spot_table: Optional[SpotTable] = None) -> bool:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = os.path.join(self.output_dir, f"spot_details_{timestamp}.json")
 
@@ -408,7 +596,7 @@ def create_sheets_integration(credentials_path: str = "credentials/service_accou
     Returns:
         GoogleSheetsIntegration or MockGoogleSheetsIntegration instance
     """
-    if SHEETS_AVAILABLE and os.path.exists(credentials_path):
+    if os.path.exists(credentials_path) and sheets_available():
         integration = GoogleSheetsIntegration(credentials_path)
         if integration.authenticate():
             return integration
@@ -10,12 +10,58 @@ import json
 import argparse
 import os
 import time
+import struct
+import queue
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 import logging
 
 # Import our custom modules
 from car_detector import CarDetector
+import geom
+
+# Spot types, in the order used by ParkingMonitor.spot_types
+# (any other type in a config file is treated like a normal spot)
+SPOT_TYPES = ('normal', 'electric', 'reserved')
+NORMAL, ELECTRIC, RESERVED = range(len(SPOT_TYPES))
+
+# Occupancy log rows start with: timestamp, total spots, occupied spots.
+# Then come one occupied byte and one float32 confidence per spot.
+OCC_LOG_HEADER = struct.Struct('<dii')
+
+
+def read_occupancy_log(log_path: str) -> List[Dict]:
+    """
+    Read an occupancy log written by ParkingMonitor.append_occupancy_log()
+
+    Args:
+        log_path: Path to the .bin log file
+
+    Returns:
+        One dictionary per checkpoint, with 'timestamp', 'total_spots',
+        'occupied_spots', 'occupied' and 'confidence' (per-spot lists)
+    """
+    with open(log_path, 'rb') as f:
+        data = f.read()
+
+    rows = []
+    pos = 0
+    while pos + OCC_LOG_HEADER.size <= len(data):
+        timestamp, total, occupied_count = OCC_LOG_HEADER.unpack_from(data, pos)
+        pos += OCC_LOG_HEADER.size
+        occupied = np.frombuffer(data, dtype=np.uint8, count=total, offset=pos).astype(bool)
+        pos += total
+        confidence = np.frombuffer(data, dtype='<f4', count=total, offset=pos)
+        pos += 4 * total
+        rows.append({
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+            'total_spots': total,
+            'occupied_spots': occupied_count,
+            'occupied': occupied.tolist(),
+            'confidence': confidence.astype(float).tolist()
+        })
+    return rows
 
 
 class ParkingMonitor:
@@ -32,6 +78,19 @@ class ParkingMonitor:
         self.video = None
         self.spots = []
         self.car_detector = CarDetector()
+        self.cone_scale = 2  # Cone detection works on a frame shrunk by this factor
+
+        # Cone detection settings and buffers, reused every frame
+        self._cone_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        self._cone_lower = np.array([10, 100, 100])  # Range for orange color (HSV)
+        self._cone_upper = np.array([25, 255, 255])
+        self._cone_hsv = None
+        self._cone_mask = None
+        self._cone_mask_tmp = None
+        self.prefetch = 8  # Frames buffered between the reader, processor and writer threads
+        self.detect_every = 1  # Run car detection on every Nth frame only
+        self.display_every = 1  # When only displaying (not saving), redraw every Nth frame
+        self._last_detections = None
         self.frame_count = 0
         self.total_spots = 0
         self.occupied_spots = 0
@@ -47,10 +106,29 @@ class ParkingMonitor:
         )
         self.logger = logging.getLogger(__name__)
 
+        # Run cone detection on the GPU when OpenCV was built with CUDA
+        self._init_cone_gpu()
+
+        # Spot state, one array entry per spot (same order as self.spots)
+        self._init_spot_arrays()
+
         # Tracking data
         self.occupancy_history = []
+        self.occupancy_log_path = None  # Set when the first checkpoint is written
+        self._occ_log = None
         self.last_update_time = time.time()
 
+        # Black background for the info panel (300x150, border included)
+        self._panel_bg = np.zeros((151, 301, 3), dtype=np.uint8)
+
+        # Info panel text lines, formatted again only when what they show
+        # changes (at most once a second, for the clock)
+        self._panel_lines = []
+        self._panel_lines_key = None
+
+        # Reused buffer for the spot fill overlay (see draw_spots)
+        self._overlay_buf = None
+
         # Colors for visualization
         self.colors = {
             'free': (0, 255, 0),         # Green for free spots
@@ -60,6 +138,65 @@ class ParkingMonitor:
             'reserved': (128, 128, 128),  # Gray for reserved spots
             'cone_detected': (255, 0, 255)  # Magenta for cone detection
         }
+        self._build_color_lut()
+
+    def _build_color_lut(self) -> None:
+        """
+        Build the spot color table: self._color_lut[spot_type, occupied] is the
+        BGR color for that combination (call again after changing self.colors)
+        """
+        self._color_lut = np.array([
+            [self.colors['free'], self.colors['occupied']],                    # NORMAL
+            [self.colors['electric_free'], self.colors['electric_occupied']],  # ELECTRIC
+            [self.colors['reserved'], self.colors['reserved']],                # RESERVED
+        ], dtype=np.uint8)
+
+    def _init_spot_arrays(self) -> None:
+        """
+        Build the per-spot arrays from self.spots
+
+        Keeping each field in its own array (instead of inside every spot
+        dictionary) lets the per-frame code update and read all spots at once.
+        """
+        n = len(self.spots)
+        self.spot_types = np.array(
+            [SPOT_TYPES.index(s.get('type')) if s.get('type') in SPOT_TYPES else NORMAL for s in self.spots],
+            dtype=np.int8
+        )
+        self.spot_occupied = np.zeros(n, dtype=bool)
+        self.spot_confidence = np.zeros(n, dtype=np.float64)
+        self.spot_last_detection = np.zeros(n, dtype=np.float64)
+
+        # Corner points as int32 arrays (ready for OpenCV drawing) and centers
+        self.spot_polygons = [np.asarray(s['points'], dtype=np.int32) for s in self.spots]
+        self.spot_centers = np.array(
+            [polygon.mean(axis=0) for polygon in self.spot_polygons], dtype=np.float64
+        ).reshape(-1, 2).astype(np.int32)
+
+        # Spot labels for draw_spots: (ID text, ID position, confidence position)
+        self.spot_labels = [
+            (str(spot['id']), (cx - 10, cy), (cx - 15, cy + 15))
+            for spot, (cx, cy) in zip(self.spots, self.spot_centers.tolist())
+        ]
+
+        # Edge tables of all spots packed into one array for geom.spot_occupancy()
+        self.spot_edges, self.spot_offsets = geom.pack_polygons(
+            [np.column_stack([s['_px'], s['_py']]) for s in self.spots]
+        )
+
+        # Area covered by all spots (x0, y0, x1, y1), the part of the frame
+        # draw_spots has to blend
+        if n > 0:
+            all_points = np.concatenate(self.spot_polygons)
+            self.spots_area = (*all_points.min(axis=0).tolist(), *(all_points.max(axis=0) + 1).tolist())
+        else:
+            self.spots_area = (0, 0, 0, 0)
+
+        # Bounding box of every spot (xmin, ymin, xmax, ymax) for quick rejection
+        self.spot_boxes = np.array(
+            [[s['_px'].min(), s['_py'].min(), s['_px'].max(), s['_py'].max()] for s in self.spots],
+            dtype=np.float64
+        ).reshape(-1, 4)
 
     def load_spots_config(self) -> bool:
         """
@@ -75,11 +212,14 @@ class ParkingMonitor:
             self.spots = config['spots']
             self.total_spots = len(self.spots)
 
-            # Initialize occupancy status
             for spot in self.spots:
-                spot['occupied'] = False
-                spot['last_detection_time'] = 0
-                spot['confidence'] = 0.0
+                # Polygon corners as arrays, prepared once for the per-frame checks
+                points = np.asarray(spot['points'], dtype=np.float64)
+                spot['_px'] = np.ascontiguousarray(points[:, 0])
+                spot['_py'] = np.ascontiguousarray(points[:, 1])
+
+            # Initialize occupancy status
+            self._init_spot_arrays()
 
             self.logger.info(f"Loaded {len(self.spots)} parking spots from {self.spots_config}")
 
@@ -109,7 +249,7 @@ class ParkingMonitor:
             self.logger.error(f"Video file not found: {self.video_path}")
             return False
 
-        self.video = cv2.VideoCapture(self.video_path)
+        self.video = self._open_capture(self.video_path)
         if not self.video.isOpened():
             self.logger.error(f"Could not open video: {self.video_path}")
             return False
@@ -123,180 +263,291 @@ class ParkingMonitor:
         self.logger.info(f"Video loaded: {width}x{height} @ {fps:.1f}fps, {frame_count} frames")
         return True
 
-    def point_in_polygon(self, point: Tuple[int, int], polygon: List[Tuple[int, int]]) -> bool:
+    def _open_capture(self, video_path: str) -> cv2.VideoCapture:
+        """
+        Open a video, asking FFmpeg for hardware-accelerated decoding
+        (VAAPI, NVDEC, VideoToolbox, ...) and falling back to the default reader
+
+        Args:
+            video_path: Path to the video file
+
+        Returns:
+            The opened (or failed) VideoCapture
+        """
+        try:
+            # (no CAP_PROP_HW_DEVICE - FFmpeg rejects a device index with "ANY")
+            video = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY
+            ])
+            if video.isOpened():
+                if video.get(cv2.CAP_PROP_HW_ACCELERATION) != cv2.VIDEO_ACCELERATION_NONE:
+                    self.logger.info("🚀 Using hardware video decoding")
+                return video
+            video.release()
+        except (AttributeError, cv2.error):
+            pass  # OpenCV too old for hardware acceleration settings
+
+        return cv2.VideoCapture(video_path)
+
+    def _open_writer(self, output_path: str, fourcc: int, fps: float,
+                     size: Tuple[int, int]) -> cv2.VideoWriter:
+        """
+        Open a video writer, asking FFmpeg for hardware-accelerated encoding
+        when available and falling back to the default writer
+
+        Args:
+            output_path: Path of the video to write
+            fourcc: Codec code from cv2.VideoWriter_fourcc
+            fps: Frames per second
+            size: (width, height) of the frames
+
+        Returns:
+            The opened (or failed) VideoWriter
+        """
+        try:
+            writer = cv2.VideoWriter(output_path, cv2.CAP_FFMPEG, fourcc, fps, size, [
+                cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY
+            ])
+            if writer.isOpened():
+                return writer
+            writer.release()
+        except (AttributeError, cv2.error):
+            pass  # OpenCV too old for hardware acceleration settings
+
+        return cv2.VideoWriter(output_path, fourcc, fps, size)
+
+    def _init_cone_gpu(self) -> bool:
+        """
+        Set up the CUDA filters for cone detection, if a CUDA device is available
+
+        Returns:
+            True if cone detection will run on the GPU
+        """
+        self.use_cuda_cones = False
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                kernel = self._cone_kernel
+                self._cone_gpu = cv2.cuda_GpuMat()
+                self._cone_open = cv2.cuda.createMorphologyFilter(cv2.MORPH_OPEN, cv2.CV_8UC1, kernel)
+                self._cone_close = cv2.cuda.createMorphologyFilter(cv2.MORPH_CLOSE, cv2.CV_8UC1, kernel)
+                self.use_cuda_cones = True
+                self.logger.info("🚀 Using CUDA for cone detection")
+        except (AttributeError, cv2.error):
+            pass  # OpenCV was built without CUDA
+        return self.use_cuda_cones
+
+    def _cone_mask_cuda(self, frame: np.ndarray, size: Tuple[int, int],
+                        small: np.ndarray = None) -> np.ndarray:
         """
-        Check if a point is inside a polygon using ray casting algorithm
+        Build the cleaned-up orange pixel mask on the GPU
+        (same steps as the CPU version in detect_orange_cones)
 
         Args:
-            point: (x, y) coordinates of the point
-            polygon: List of (x, y) coordinates defining the polygon
+            frame: Input frame (full size)
+            size: (width, height) to shrink the frame to
+            small: The frame already shrunk to size (optional)
 
         Returns:
-            True if point is inside polygon, False otherwise
+            Binary mask, downloaded back to a NumPy array
+        """
+        if small is not None:
+            self._cone_gpu.upload(small)
+            small = self._cone_gpu
+        else:
+            self._cone_gpu.upload(frame)
+            small = cv2.cuda.resize(self._cone_gpu, size, interpolation=cv2.INTER_AREA)
+        hsv = cv2.cuda.cvtColor(small, cv2.COLOR_BGR2HSV)
+
+        # inRange is missing from some CUDA builds, so threshold each channel:
+        # 10 <= H <= 25, S >= 100, V >= 100
+        h, s, v = cv2.cuda.split(hsv)
+        _, h_low = cv2.cuda.threshold(h, 9, 255, cv2.THRESH_BINARY)
+        _, h_high = cv2.cuda.threshold(h, 25, 255, cv2.THRESH_BINARY_INV)
+        _, s_ok = cv2.cuda.threshold(s, 99, 255, cv2.THRESH_BINARY)
+        _, v_ok = cv2.cuda.threshold(v, 99, 255, cv2.THRESH_BINARY)
+        mask = cv2.cuda.bitwise_and(h_low, h_high)
+        mask = cv2.cuda.bitwise_and(mask, s_ok)
+        mask = cv2.cuda.bitwise_and(mask, v_ok)
+
+        # Apply morphological operations to clean up the mask
+        mask = self._cone_open.apply(mask)
+        mask = self._cone_close.apply(mask)
+
+        # Only the small binary mask comes back - blob finding runs on the CPU
+        return mask.download()
+
+    def shrink_frame(self, frame: np.ndarray) -> np.ndarray:
         """
-        x, y = point
-        n = len(polygon)
-        inside = False
+        Shrink a frame by cone_scale for the analysis steps
 
-        p1x, p1y = polygon[0]
-        for i in range(1, n + 1):
-            p2x, p2y = polygon[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
+        Args:
+            frame: Input frame
 
-        return inside
+        Returns:
+            Smaller copy of the frame
+        """
+        scale = self.cone_scale
+        return cv2.resize(frame, (frame.shape[1] // scale, frame.shape[0] // scale),
+                          interpolation=cv2.INTER_AREA)
 
-    def detect_orange_cones(self, frame: np.ndarray) -> List[Tuple[int, int]]:
+    def detect_orange_cones(self, frame: np.ndarray, small: np.ndarray = None) -> List[Tuple[int, int]]:
         """
         Detect orange cones in the frame using color detection
 
         Args:
             frame: Input frame
+            small: The frame already shrunk with shrink_frame() (optional)
 
         Returns:
             List of (x, y) coordinates of detected cones
         """
-        # Convert to HSV for better color detection
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        # Cones are big blobs of color, so half resolution is plenty
+        scale = self.cone_scale
+        size = (frame.shape[1] // scale, frame.shape[0] // scale)
 
-        # Define range for orange color
-        lower_orange = np.array([10, 100, 100])
-        upper_orange = np.array([25, 255, 255])
+        if self.use_cuda_cones:
+            mask = self._cone_mask_cuda(frame, size, small)
+        else:
+            if small is None:
+                small = self.shrink_frame(frame)
 
-        # Create mask for orange pixels
-        mask = cv2.inRange(hsv, lower_orange, upper_orange)
+            # Buffers are allocated on the first frame and written into after that
+            if self._cone_hsv is None or self._cone_hsv.shape != small.shape:
+                self._cone_hsv = np.empty_like(small)
+                self._cone_mask = np.empty(small.shape[:2], dtype=np.uint8)
+                self._cone_mask_tmp = np.empty(small.shape[:2], dtype=np.uint8)
 
-        # Apply morphological operations to clean up the mask
-        kernel = np.ones((5, 5), np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+            # Convert to HSV for better color detection
+            hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV, dst=self._cone_hsv)
+
+            # Create mask for orange pixels
+            mask = cv2.inRange(hsv, self._cone_lower, self._cone_upper, dst=self._cone_mask_tmp)
+
+            # Apply morphological operations to clean up the mask
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._cone_kernel, dst=self._cone_mask)
+            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._cone_kernel, dst=self._cone_mask_tmp)
 
-        # Find contours
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Find orange blobs - one pass gives the area and center of every blob
+        _, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        areas = stats[1:, cv2.CC_STAT_AREA]  # Label 0 is the background
+        centroids = centroids[1:]
 
-        cone_centers = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            # Filter by area (cones should be medium-sized objects)
-            if 200 < area < 2000:
-                # Calculate center of contour
-                M = cv2.moments(contour)
-                if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
-                    cone_centers.append((cx, cy))
+        # Filter by area (cones should be medium-sized objects)
+        # (thresholds are in full-size pixels, so shrink them to match)
+        keep = (areas > 200 / (scale * scale)) & (areas < 2000 / (scale * scale))
 
-        return cone_centers
+        # Scale centers back up to full-size frame coordinates
+        cone_centers = (centroids[keep] * scale).astype(int)
 
-    def check_spot_occupancy(self, frame: np.ndarray, detections: List[Dict]) -> None:
+        return [tuple(center) for center in cone_centers.tolist()]
+
+    def check_spot_occupancy(self, frame: np.ndarray, detections: np.ndarray,
+                             small: np.ndarray = None) -> None:
         """
         Check occupancy status for each parking spot
 
         Args:
             frame: Current video frame
-            detections: List of car detections from car detector
+            detections: Car detection array from car detector ([x, y, w, h, confidence, class_id] rows)
+            small: The frame already shrunk with shrink_frame() (optional)
         """
         # Detect orange cones
-        orange_cones = self.detect_orange_cones(frame)
-
-        for spot in self.spots:
-            spot_polygon = [(p[0], p[1]) for p in spot['points']]
-            spot_occupied = False
-            max_confidence = 0.0
-
-            # Check for car detections in this spot
-            for detection in detections:
-                bbox = detection['bbox']
-                confidence = detection['confidence']
-
-                # Calculate center of bounding box
-                center_x = bbox[0] + bbox[2] // 2
-                center_y = bbox[1] + bbox[3] // 2
-
-                # Check if car center is in parking spot
-                if self.point_in_polygon((center_x, center_y), spot_polygon):
-                    spot_occupied = True
-                    max_confidence = max(max_confidence, confidence)
-
-            # Check for orange cones in this spot
-            for cone_x, cone_y in orange_cones:
-                if self.point_in_polygon((cone_x, cone_y), spot_polygon):
-                    spot_occupied = True
-                    max_confidence = max(max_confidence, 0.8)  # High confidence for cone detection
-
-            # Update spot status
-            spot['occupied'] = spot_occupied
-            spot['confidence'] = max_confidence
-            if spot_occupied:
-                spot['last_detection_time'] = time.time()
+        orange_cones = self.detect_orange_cones(frame, small)
+
+        # Centers of all cars and cones in one array, with a confidence for each
+        # (cones count as high confidence)
+        boxes = detections[:, :4].astype(int)
+        car_centers = boxes[:, :2] + boxes[:, 2:] // 2
+        cone_centers = np.array(orange_cones, dtype=int).reshape(-1, 2)
+        centers = np.vstack([car_centers, cone_centers])
+        confidences = np.concatenate([detections[:, 4], np.full(len(cone_centers), 0.8)])
+
+        # Check every center against every spot (compiled loop, see geom.py)
+        occupied, max_confidence = geom.spot_occupancy(
+            np.ascontiguousarray(centers[:, 0], dtype=np.float64),
+            np.ascontiguousarray(centers[:, 1], dtype=np.float64),
+            np.ascontiguousarray(confidences, dtype=np.float64),
+            self.spot_edges, self.spot_offsets, self.spot_boxes
+        )
+
+        # Update spot status
+        self.spot_occupied[:] = occupied
+        self.spot_confidence[:] = max_confidence
+        self.spot_last_detection[occupied] = time.time()
 
         # Calculate total occupancy
-        self.occupied_spots = sum(1 for spot in self.spots if spot['occupied'])
+        self.occupied_spots = int(occupied.sum())
 
-    def get_spot_color(self, spot: Dict) -> Tuple[int, int, int]:
+    def get_spot_color(self, index: int) -> Tuple[int, int, int]:
         """
         Get color for spot visualization based on type and occupancy
 
         Args:
-            spot: Spot dictionary
+            index: Spot index (position in self.spots)
 
         Returns:
             BGR color tuple
         """
-        spot_type = spot.get('type', 'normal')
-        occupied = spot['occupied']
-
-        if spot_type == 'electric':
-            return self.colors['electric_occupied'] if occupied else self.colors['electric_free']
-        elif spot_type == 'reserved':
-            return self.colors['reserved']
-        else:
-            return self.colors['occupied'] if occupied else self.colors['free']
+        return tuple(self._color_lut[self.spot_types[index], int(self.spot_occupied[index])].tolist())
 
     def draw_spots(self, frame: np.ndarray) -> np.ndarray:
         """
         Draw parking spots on frame with occupancy status
 
         Args:
-            frame: Input frame
+            frame: Input frame (drawn on in place)
 
         Returns:
             Frame with spots drawn
         """
-        display_frame = frame.copy()
-
-        for spot in self.spots:
-            points = np.array(spot['points'], np.int32)
-            color = self.get_spot_color(spot)
-            confidence = spot.get('confidence', 0)
-
-            # Draw filled polygon
-            overlay = display_frame.copy()
-            cv2.fillPoly(overlay, [points], color)
-            cv2.addWeighted(display_frame, 0.7, overlay, 0.3, 0, display_frame)
-
-            # Draw outline
-            thickness = 3 if spot['occupied'] else 2
-            cv2.polylines(display_frame, [points], True, color, thickness)
-
-            # Draw spot ID and info
-            center_x = int(np.mean([p[0] for p in spot['points']]))
-            center_y = int(np.mean([p[1] for p in spot['points']]))
+        display_frame = frame  # Drawn in place - run() passes a frame it owns
+
+        # Group spots by color and outline thickness, so every group is drawn
+        # with one fillPoly / polylines call instead of one call per spot
+        # (colors for all spots come from one color table lookup)
+        colors = self._color_lut[self.spot_types, self.spot_occupied.astype(np.intp)].tolist()
+        occupied = self.spot_occupied.tolist()
+        fill_groups = {}
+        outline_groups = {}
+        for i in range(len(self.spots)):
+            points = self.spot_polygons[i]
+            color = tuple(colors[i])
+            thickness = 3 if occupied[i] else 2
+            fill_groups.setdefault(color, []).append(points)
+            outline_groups.setdefault((color, thickness), []).append(points)
+
+        # Draw filled polygons - all on one overlay, blended once. Only the
+        # area around the spots is blended, using an overlay buffer that is
+        # allocated once and reused
+        height, width = display_frame.shape[:2]
+        x0, y0 = max(self.spots_area[0], 0), max(self.spots_area[1], 0)
+        x1, y1 = min(self.spots_area[2], width), min(self.spots_area[3], height)
+        if x0 < x1 and y0 < y1:
+            roi = display_frame[y0:y1, x0:x1]
+            if self._overlay_buf is None or self._overlay_buf.shape != roi.shape:
+                self._overlay_buf = np.empty_like(roi)
+            overlay = self._overlay_buf
+            np.copyto(overlay, roi)
+            for color, polygons in fill_groups.items():
+                cv2.fillPoly(overlay, polygons, color, offset=(-x0, -y0))
+            cv2.addWeighted(roi, 0.7, overlay, 0.3, 0, roi)
+
+        # Draw outlines
+        for (color, thickness), polygons in outline_groups.items():
+            cv2.polylines(display_frame, polygons, True, color, thickness)
+
+        # Draw spot ID and info
+        confidences = self.spot_confidence.tolist()
+        for i, (label, label_pos, confidence_pos) in enumerate(self.spot_labels):
+            confidence = confidences[i]
 
             # Spot ID
-            cv2.putText(display_frame, str(spot['id']), (center_x-10, center_y),
+            cv2.putText(display_frame, label, label_pos,
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
             # Confidence (if occupied)
-            if spot['occupied'] and confidence > 0:
-                cv2.putText(display_frame, f"{confidence:.2f}",
-                           (center_x-15, center_y+15),
+            if occupied[i] and confidence > 0:
+                cv2.putText(display_frame, f"{confidence:.2f}", confidence_pos,
                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
 
         return display_frame
@@ -306,25 +557,24 @@ class ParkingMonitor:
         Draw information panel with statistics
 
         Args:
-            frame: Input frame
+            frame: Input frame (drawn on in place)
 
         Returns:
             Frame with info panel
         """
-        display_frame = frame.copy()
+        display_frame = frame  # Drawn in place - run() passes a frame it owns
         height, width = display_frame.shape[:2]
 
         # Create info panel background
-        panel_height = 150
-        panel_width = 300
+        panel_height = self._panel_bg.shape[0] - 1
+        panel_width = self._panel_bg.shape[1] - 1
         panel_x = width - panel_width - 10
         panel_y = 10
 
-        overlay = display_frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y),
-                     (panel_x + panel_width, panel_y + panel_height),
-                     (0, 0, 0), -1)
-        cv2.addWeighted(display_frame, 0.7, overlay, 0.3, 0, display_frame)
+        # Darken only the panel area (blending with black) instead of the whole frame
+        roi = display_frame[panel_y:panel_y + panel_height + 1,
+                            max(panel_x, 0):panel_x + panel_width + 1]
+        cv2.addWeighted(roi, 0.7, self._panel_bg[:roi.shape[0], :roi.shape[1]], 0.3, 0, roi)
 
         # Draw border
         cv2.rectangle(display_frame, (panel_x, panel_y),
@@ -332,45 +582,40 @@ class ParkingMonitor:
                      (255, 255, 255), 2)
 
         # Add text information
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.6
-        color = (255, 255, 255)
-        thickness = 2
+        now = time.time()
+        key = (int(now), self.total_spots, self.occupied_spots)
+        if key != self._panel_lines_key:
+            self._panel_lines = self._format_panel_lines(now)
+            self._panel_lines_key = key
+        for text, (x, y), font_scale, color, thickness in self._panel_lines:
+            cv2.putText(display_frame, text, (panel_x + x, panel_y + y),
+                       cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
 
-        y_offset = panel_y + 25
-        line_height = 20
-
-        # Title
-        cv2.putText(display_frame, "PARKING STATUS",
-                   (panel_x + 10, y_offset), font, 0.7, color, thickness)
-        y_offset += line_height * 1.5
-
-        # Statistics
-        available = self.total_spots - self.occupied_spots
-        cv2.putText(display_frame, f"Total Spots: {self.total_spots}",
-                   (int(panel_x + 10), int(y_offset)), font, font_scale, color, 1)
-        y_offset += line_height
+        return display_frame
 
-        cv2.putText(display_frame, f"Available: {available}",
-                   (int(panel_x + 10), int(y_offset)), font, font_scale, self.colors['free'], thickness)
-        y_offset += line_height
+    def _format_panel_lines(self, now: float) -> List[Tuple]:
+        """
+        Text lines of the info panel (positions relative to its top-left corner)
 
-        cv2.putText(display_frame, f"Occupied: {self.occupied_spots}",
-                   (int(panel_x + 10), int(y_offset)), font, font_scale, self.colors['occupied'], thickness)
-        y_offset += line_height
+        Args:
+            now: Current time (seconds since the epoch)
 
-        # Occupancy percentage
+        Returns:
+            (text, (x, y), font_scale, color, thickness) tuples
+        """
+        color = (255, 255, 255)
+        available = self.total_spots - self.occupied_spots
         occupancy_rate = (self.occupied_spots / self.total_spots * 100) if self.total_spots > 0 else 0
-        cv2.putText(display_frame, f"Occupancy: {occupancy_rate:.1f}%",
-                   (int(panel_x + 10), int(y_offset)), font, font_scale, color, 1)
-        y_offset += line_height
+        timestamp = datetime.fromtimestamp(now).strftime("%H:%M:%S")
 
-        # Timestamp
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        cv2.putText(display_frame, f"Updated: {timestamp}",
-                   (int(panel_x + 10), int(y_offset)), font, 0.4, color, 1)
-
-        return display_frame
+        return [
+            ("PARKING STATUS", (10, 25), 0.7, color, 2),
+            (f"Total Spots: {self.total_spots}", (10, 55), 0.6, color, 1),
+            (f"Available: {available}", (10, 75), 0.6, self.colors['free'], 2),
+            (f"Occupied: {self.occupied_spots}", (10, 95), 0.6, self.colors['occupied'], 2),
+            (f"Occupancy: {occupancy_rate:.1f}%", (10, 115), 0.6, color, 1),
+            (f"Updated: {timestamp}", (10, 135), 0.4, color, 1),
+        ]
 
     def save_occupancy_data(self, output_path: str = None) -> None:
         """
@@ -396,13 +641,17 @@ class ParkingMonitor:
             'spots': []
         }
 
-        for spot in self.spots:
+        # Turn the per-spot arrays back into one dictionary per spot
+        occupied = self.spot_occupied.tolist()
+        confidence = self.spot_confidence.tolist()
+        last_detection = self.spot_last_detection.tolist()
+        for i, spot in enumerate(self.spots):
             spot_data = {
                 'id': spot['id'],
                 'type': spot.get('type', 'normal'),
-                'occupied': spot['occupied'],
-                'confidence': spot.get('confidence', 0.0),
-                'last_detection_time': spot.get('last_detection_time', 0)
+                'occupied': occupied[i],
+                'confidence': confidence[i],
+                'last_detection_time': last_detection[i]
             }
             occupancy_data['spots'].append(spot_data)
 
@@ -413,6 +662,98 @@ class ParkingMonitor:
         except Exception as e:
             self.logger.error(f"Error saving occupancy data: {str(e)}")
 
+    def append_occupancy_log(self) -> None:
+        """
+        Append the current occupancy to the binary log (a small fixed-size
+        row per checkpoint, much cheaper than writing the whole JSON file)
+        """
+        if self._occ_log is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.occupancy_log_path = f"output/results/occupancy_{timestamp}.bin"
+            os.makedirs(os.path.dirname(self.occupancy_log_path), exist_ok=True)
+            self._occ_log = open(self.occupancy_log_path, 'ab')
+
+        try:
+            self._occ_log.write(OCC_LOG_HEADER.pack(time.time(), self.total_spots, self.occupied_spots))
+            self._occ_log.write(self.spot_occupied.astype(np.uint8).tobytes())
+            self._occ_log.write(self.spot_confidence.astype('<f4').tobytes())
+            self._occ_log.flush()
+        except Exception as e:
+            self.logger.error(f"Error writing occupancy log: {str(e)}")
+
+    def close_occupancy_log(self) -> None:
+        """Close the binary occupancy log, if one was opened"""
+        if self._occ_log is not None:
+            self._occ_log.close()
+            self._occ_log = None
+            self.logger.info(f"Occupancy log saved to: {self.occupancy_log_path}")
+
+    def _put(self, q: queue.Queue, item, stop: threading.Event) -> bool:
+        """
+        Put an item on a queue, giving up if the pipeline is stopping
+
+        Returns:
+            True if the item was queued
+        """
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue, stop: threading.Event):
+        """
+        Get an item from a queue, giving up if the pipeline is stopping
+
+        Returns:
+            The item, or None if the pipeline stopped first
+        """
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _reader(self, read_q: queue.Queue, stop: threading.Event) -> None:
+        """
+        Reader thread: decode frames and hand them to the main loop
+        (None marks the end of the video)
+        """
+        # Frames are decoded into a ring of reused buffers instead of a new
+        # array per frame. A buffer is only reused after every frame that can
+        # still be in use has been passed: up to prefetch + 1 in the read queue
+        # and reader, 1 being processed, and prefetch + 1 in the write queue
+        # and writer - so the ring has a couple more buffers than that.
+        buffers = [None] * (2 * self.prefetch + 5)
+        index = 0
+        while not stop.is_set():
+            ret, frame = self.video.read(buffers[index])
+            if not ret:
+                break
+            buffers[index] = frame
+            index = (index + 1) % len(buffers)
+            if not self._put(read_q, frame, stop):
+                return
+        self._put(read_q, None, stop)
+
+    def _writer(self, video_writer, write_q: queue.Queue, stop: threading.Event) -> None:
+        """
+        Writer thread: encode finished frames until None arrives
+        (stops the whole pipeline if writing fails, e.g. on a full disk)
+        """
+        try:
+            while True:
+                frame = write_q.get()
+                if frame is None:
+                    break
+                video_writer.write(frame)
+        except Exception as e:
+            self.logger.error(f"Error writing output video: {str(e)}")
+            stop.set()
+
     def run(self, save_output: bool = False, display: bool = True) -> None:
         """
         Run the parking monitoring system
@@ -441,46 +782,76 @@ class ParkingMonitor:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"output/results/parking_monitor_{timestamp}.mp4"
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            video_writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+            video_writer = self._open_writer(output_path, fourcc, fps, (width, height))
 
         if display:
             cv2.namedWindow('Parking Monitor', cv2.WINDOW_NORMAL)
 
+        # Decoding and encoding run in their own threads so they overlap with
+        # detection; bounded queues stop a fast reader from filling up memory.
+        # Detection, drawing and the window all stay on this (main) thread.
+        stop = threading.Event()
+        read_q = queue.Queue(maxsize=self.prefetch)
+        write_q = queue.Queue(maxsize=self.prefetch)
+
+        reader = threading.Thread(target=self._reader, args=(read_q, stop), daemon=True)
+        reader.start()
+
+        writer = None
+        if video_writer:
+            writer = threading.Thread(target=self._writer, args=(video_writer, write_q, stop), daemon=True)
+            writer.start()
+
         try:
             while True:
-                ret, frame = self.video.read()
-                if not ret:
+                frame = self._get(read_q, stop)
+                if frame is None:
                     break
 
                 self.frame_count += 1
 
-                # Detect cars in frame
-                detections = self.car_detector.detect_cars(frame)
+                # Shrink the frame once - car and cone detection both work on
+                # the small copy, only drawing uses the full-size frame
+                small = self.shrink_frame(frame)
+                car_small = small if self.car_detector.basic_scale == self.cone_scale else None
+
+                # Detect cars in frame - parked cars barely move between frames,
+                # so in between detections reuse the last result
+                if self._last_detections is None or self.frame_count % self.detect_every == 0:
+                    self._last_detections = self.car_detector.detect_cars(frame, car_small)
+                detections = self._last_detections
 
                 # Check parking spot occupancy
-                self.check_spot_occupancy(frame, detections)
+                self.check_spot_occupancy(frame, detections, small)
 
-                # Draw car detections
-                frame_with_cars = self.car_detector.draw_detections(frame, detections)
+                # Drawing is only needed for frames that are saved or shown
+                # (saved videos need every frame, the window can skip some)
+                render = bool(writer) or (display and self.frame_count % self.display_every == 0)
+                if render:
+                    # All drawing happens in place on the decoded frame
+                    display_frame = frame
 
-                # Draw parking spots
-                frame_with_spots = self.draw_spots(frame_with_cars)
+                    # Draw car detections
+                    self.car_detector.draw_detections(display_frame, detections)
 
-                # Draw info panel
-                display_frame = self.draw_info_panel(frame_with_spots)
+                    # Draw parking spots
+                    self.draw_spots(display_frame)
 
-                # Save frame if requested
-                if video_writer:
-                    video_writer.write(display_frame)
+                    # Draw info panel
+                    self.draw_info_panel(display_frame)
 
-                # Display frame
-                if display:
-                    cv2.imshow('Parking Monitor', display_frame)
+                    # Save frame if requested
+                    if writer and not self._put(write_q, display_frame, stop):
+                        break  # The writer failed (see the error above)
+
+                    # Display frame
+                    if display:
+                        cv2.imshow('Parking Monitor', display_frame)
 
-                # Save occupancy data periodically (every 30 seconds)
+                # Log occupancy data periodically (every 30 seconds)
                 current_time = time.time()
                 if current_time - self.last_update_time > 30:
-                    self.save_occupancy_data()
+                    self.append_occupancy_log()
                     self.last_update_time = current_time
 
                 # Handle key presses
@@ -496,15 +867,29 @@ class ParkingMonitor:
             self.logger.info("Monitoring stopped by user")
 
         finally:
-            # Cleanup
+            # Cleanup - stop the reader before releasing the video it reads from,
+            # and let the writer finish the queued frames before closing the file
+            stop.set()
+            reader.join()
             if self.video:
                 self.video.release()
+            if writer:
+                # A writer that failed no longer empties its queue - only a
+                # running one gets the end marker
+                while writer.is_alive():
+                    try:
+                        write_q.put(None, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                writer.join()
             if video_writer:
                 video_writer.release()
             if display:
                 cv2.destroyAllWindows()
 
             # Save final occupancy data
+            self.close_occupancy_log()
             self.save_occupancy_data()
             self.logger.info("Parking monitoring session ended")
 
@@ -516,6 +901,10 @@ def main():
     parser.add_argument("--spots", required=True, help="Path to parking spots configuration JSON")
     parser.add_argument("--save", action="store_true", help="Save output video")
     parser.add_argument("--no-display", action="store_true", help="Run without display (headless mode)")
+    parser.add_argument("--detect-every", type=int, default=1,
+                        help="Run car detection every N frames (default: every frame)")
+    parser.add_argument("--display-every", type=int, default=1,
+                        help="Redraw the window every N frames when not saving (default: every frame)")
 
     args = parser.parse_args()
 
@@ -525,6 +914,8 @@ def main():
 
     # Initialize and run monitor
     monitor = ParkingMonitor(args.video, args.spots)
+    monitor.detect_every = max(1, args.detect_every)
+    monitor.display_every = max(1, args.display_every)
     monitor.run(save_output=args.save, display=not args.no_display)
 
 
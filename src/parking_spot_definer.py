@@ -24,6 +24,11 @@ class ParkingSpotDefiner:
         self.frame = None
         self.spots = []
         self.current_spot = []
+
+        # Drawing data for each spot (same order as self.spots), computed once
+        # when a spot is added instead of on every frame
+        self.spot_contours = []
+        self.spot_centers = []
         self.drawing = False
         self.spot_counter = 1
 
@@ -37,6 +42,10 @@ class ParkingSpotDefiner:
 
         self.current_spot_type = 'normal'
 
+        # Instruction lines, rebuilt only when the spot type changes
+        self._instructions = []
+        self._instructions_type = None
+
     def load_video(self) -> bool:
         """
         Load video file
@@ -64,6 +73,24 @@ class ParkingSpotDefiner:
         print(f"📐 Frame size: {frame.shape[1]}x{frame.shape[0]}")
         return True
 
+    def _add_spot_geometry(self, spot: Dict) -> None:
+        """
+        Cache the contour and center of a newly added spot
+
+        Args:
+            spot: Spot dictionary with 'points'
+        """
+        contour = np.asarray(spot['points'], dtype=np.int32)
+        self.spot_contours.append(contour)
+        self.spot_centers.append(tuple(contour.mean(axis=0).astype(int).tolist()))
+
+    def _rebuild_spot_geometry(self) -> None:
+        """Recompute the cached contours and centers for all spots"""
+        self.spot_contours = []
+        self.spot_centers = []
+        for spot in self.spots:
+            self._add_spot_geometry(spot)
+
     def mouse_callback(self, event, x, y, flags, param):
         """
         Handle mouse events for drawing parking spots
@@ -88,6 +115,7 @@ class ParkingSpotDefiner:
                     'occupied': False
                 }
                 self.spots.append(spot_data)
+                self._add_spot_geometry(spot_data)
                 print(f"✅ Spot {self.spot_counter} ({self.current_spot_type}) created with {len(self.current_spot)} points")
                 self.spot_counter += 1
                 self.current_spot = []
@@ -107,8 +135,7 @@ class ParkingSpotDefiner:
         display_frame = frame.copy()
 
         # Draw existing spots
-        for spot in self.spots:
-            points = np.array(spot['points'], np.int32)
+        for spot, points, (center_x, center_y) in zip(self.spots, self.spot_contours, self.spot_centers):
             color = self.colors.get(spot['type'], self.colors['normal'])
 
             # Draw filled polygon for parking spot
@@ -118,8 +145,6 @@ class ParkingSpotDefiner:
             cv2.polylines(display_frame, [points], True, color, 2)
 
             # Draw spot ID
-            center_x = int(np.mean([p[0] for p in spot['points']]))
-            center_y = int(np.mean([p[1] for p in spot['points']]))
             cv2.putText(display_frame, str(spot['id']), (center_x-10, center_y+5),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
@@ -134,17 +159,19 @@ class ParkingSpotDefiner:
                 cv2.circle(display_frame, point, 5, self.colors['current'], -1)
 
         # Draw instructions
-        instructions = [
-            f"Current type: {self.current_spot_type.upper()}",
-            "Left click: Add point",
-            "Right click: Complete spot",
-            "Keys: n=Normal, e=Electric, r=Reserved",
-            "Keys: s=Save, c=Clear all, u=Undo last",
-            "ESC: Exit"
-        ]
+        if self._instructions_type != self.current_spot_type:
+            self._instructions = [
+                f"Current type: {self.current_spot_type.upper()}",
+                "Left click: Add point",
+                "Right click: Complete spot",
+                "Keys: n=Normal, e=Electric, r=Reserved",
+                "Keys: s=Save, c=Clear all, u=Undo last",
+                "ESC: Exit"
+            ]
+            self._instructions_type = self.current_spot_type
 
         y_offset = 30
-        for instruction in instructions:
+        for instruction in self._instructions:
             cv2.putText(display_frame, instruction, (10, y_offset),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
             cv2.putText(display_frame, instruction, (10, y_offset),
@@ -211,6 +238,7 @@ class ParkingSpotDefiner:
                 spots_data = json.load(f)
 
             self.spots = spots_data['spots']
+            self._rebuild_spot_geometry()
             self.spot_counter = len(self.spots) + 1
 
             print(f"✅ Loaded {len(self.spots)} parking spots")
@@ -262,11 +290,14 @@ class ParkingSpotDefiner:
             elif key == ord('c'):
                 self.spots = []
                 self.current_spot = []
+                self._rebuild_spot_geometry()
                 self.spot_counter = 1
                 print("🗑️  All spots cleared")
             elif key == ord('u'):
                 if self.spots:
                     removed_spot = self.spots.pop()
+                    self.spot_contours.pop()
+                    self.spot_centers.pop()
                     self.spot_counter = max(1, self.spot_counter - 1)
                     print(f"↩️  Undid spot {removed_spot['id']}")
                 else:
@@ -4,12 +4,166 @@ Video Downloader for Parking Lot Test Videos
 Downloads parking lot footage from YouTube for testing purposes.
 """
 
+import argparse
+import hashlib
+import json
 import os
+import random
+import shutil
+import sqlite3
+import threading
+import time
 import yt_dlp
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Dict
+from urllib.parse import urlparse, parse_qs
+
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+try:
+    import curl_cffi  # noqa: F401 - only needed by yt-dlp
+    from yt_dlp.networking.impersonate import ImpersonateTarget
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
+
+# Videos downloaded at the same time (more tends to trigger YouTube rate limits)
+MAX_PARALLEL_DOWNLOADS = 4
+
+# Videos looked up (info only, no download) at the same time
+MAX_PARALLEL_LOOKUPS = 8
+
+# Pieces of one video downloaded at the same time
+CONCURRENT_FRAGMENTS = 8
+
+# How long video info fetched from YouTube is reused for downloading (seconds -
+# the download links in it stop working after a few hours)
+META_CACHE_TTL = 60 * 60
+
+# Size of each HTTP range request (fewer, bigger requests = fewer round trips)
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024
+
+# Tries per video before giving up (waiting 1, 2, 4, 8... seconds in between),
+# so short network problems or YouTube rate limits don't cost a video. This is
+# the only retry loop with waits - yt-dlp's own retries are left at its quick
+# defaults, so the two don't multiply.
+DOWNLOAD_ATTEMPTS = 5
+
+# Downloaded when no URLs are given on the command line
+TEST_VIDEOS = [
+    "https://www.youtube.com/watch?v=MeSeuzBhq2E",  # Original tutorial video
+    "https://www.youtube.com/watch?v=caKnQlCMIeI",  # Parking lot surveillance
+    "https://www.youtube.com/watch?v=1E_UHOpUwOQ",  # Mall parking lot
+]
+
+# New requests (info lookups and downloads) started per second, per website
+REQUESTS_PER_SECOND = 2.0
+
+
+def _say(message: str) -> None:
+    """Print a message (above the progress bar, if there is one)"""
+    if TQDM_AVAILABLE:
+        tqdm.write(message)
+    else:
+        print(message)
+
+
+def _canon(url: str) -> str:
+    """
+    Reduce a video URL to a key that is the same for every way of writing it
+    (youtu.be/ID, youtube.com/watch?v=ID, /shorts/ID, /embed/ID all give ID)
+
+    Args:
+        url: Video URL
+
+    Returns:
+        The YouTube video ID, or the cleaned-up URL for other sites
+    """
+    url = url.strip()
+    parsed = urlparse(url if '://' in url else 'https://' + url)
+    host = parsed.netloc.lower()
+    if host.startswith('www.') or host.startswith('m.'):
+        host = host.split('.', 1)[1]
+
+    if host == 'youtu.be' or host.endswith('.youtu.be'):
+        return parsed.path.strip('/').split('/')[0] or url
+    if host == 'youtube.com' or host.endswith('.youtube.com'):
+        video_id = parse_qs(parsed.query).get('v')
+        if video_id:
+            return video_id[0]
+        parts = parsed.path.strip('/').split('/')
+        if len(parts) >= 2 and parts[0] in ('shorts', 'embed', 'live', 'v'):
+            return parts[1]
+    return url
+
+
+def _is_permanent(error: Exception) -> bool:
+    """
+    Check if a yt-dlp error will happen again however often it is retried
+    (removed or private video, missing format, HTTP 404...)
+
+    Args:
+        error: DownloadError or ExtractorError raised by yt-dlp
+
+    Returns:
+        True if retrying is pointless
+    """
+    cause = error
+    if getattr(error, 'exc_info', None):
+        cause = error.exc_info[1]  # The error behind a DownloadError
+
+    # yt-dlp marks errors it expects (not bugs or network problems) this way
+    if getattr(cause, 'expected', False):
+        return True
+
+    # HTTP 4xx means the request itself is wrong - except 429 (too many requests)
+    status = getattr(cause, 'status', None) or getattr(getattr(cause, 'cause', None), 'status', None)
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+class TokenBucket:
+    """
+    Simple thread-safe rate limiter: up to `rate` calls per second, with short
+    bursts of up to `capacity` calls
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Wait until a call is allowed"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
 
 
 class VideoDownloader:
+    # Directories already created by this process (shared by all downloaders)
+    _ensured_dirs = set()
+
+    @classmethod
+    def _ensure_dir(cls, path: str) -> None:
+        """Create a directory, once per process"""
+        if path not in cls._ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            cls._ensured_dirs.add(path)
+
     def __init__(self, output_dir: str = "data/videos"):
         """
         Initialize video downloader
@@ -18,71 +172,501 @@ class VideoDownloader:
             output_dir: Directory to save downloaded videos
         """
         self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
+        self._ensure_dir(output_dir)
+
+        # Limit how fast requests go to each website, so parallel downloads
+        # don't get throttled (HTTP 429) by YouTube
+        self.requests_per_second = REQUESTS_PER_SECOND
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+
+        # Video info is cached on disk, so re-runs don't ask YouTube again
+        self.meta_cache_dir = os.path.join(output_dir, '.meta_cache')
+        self._ensure_dir(self.meta_cache_dir)
+
+        # Every URL of a batch is tracked here (PENDING / DONE / FAILED), so an
+        # interrupted batch picks up where it stopped when run again
+        self._queue_path = os.path.join(output_dir, '.queue.sqlite')
+        with self._open_queue() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS q ("
+                       "url TEXT PRIMARY KEY, state TEXT, path TEXT, attempts INT)")
 
         # Configure yt-dlp options
         self.ydl_opts = {
             'format': 'best[height<=720]',  # Limit to 720p for processing efficiency
             'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
             'noplaylist': True,
+            'concurrent_fragment_downloads': CONCURRENT_FRAGMENTS,  # Fetch fragments in parallel
+            'http_chunk_size': HTTP_CHUNK_SIZE,
+            # Prefer H.264 video and AAC audio: YouTube's default pick is often
+            # AV1 or VP9, which many OpenCV builds can't decode
+            'format_sort': ['res:720', 'vcodec:h264', 'acodec:m4a'],
+            # yt-dlp records every finished video here and skips it next time
+            # (remove a video's line to download it again)
+            'download_archive': os.path.join(output_dir, '.archive.txt'),
         }
 
-    def download_video(self, url: str) -> str:
+        # Separate video + audio streams (DASH) come from faster servers and in
+        # fragments, which download in parallel - but they need ffmpeg to be
+        # merged afterwards (into an MP4, which OpenCV reads everywhere).
+        # yt-dlp merges them in the download worker, while the other workers
+        # keep downloading.
+        if shutil.which('ffmpeg'):
+            self.ydl_opts['format'] = 'bv*[height<=720]+ba/b[height<=720]'
+            self.ydl_opts['merge_output_format'] = 'mp4'
+
+        # With tqdm installed, download_multiple shows one progress bar for the
+        # whole batch instead of yt-dlp's own line-by-line output
+        if TQDM_AVAILABLE:
+            self.ydl_opts['quiet'] = True
+            self.ydl_opts['noprogress'] = True
+
+        # With curl_cffi installed, yt-dlp can talk to YouTube like Chrome does:
+        # HTTP/2 (many requests over one connection) and fewer bot checks
+        if CURL_CFFI_AVAILABLE:
+            try:
+                target = ImpersonateTarget('chrome')
+                with yt_dlp.YoutubeDL({'impersonate': target, 'quiet': True}):
+                    pass  # Raises if this curl_cffi version can't do it
+                self.ydl_opts['impersonate'] = target
+            except yt_dlp.utils.YoutubeDLError:
+                pass
+
+        # aria2c opens several connections per file, when it is installed
+        if shutil.which('aria2c'):
+            self.ydl_opts['external_downloader'] = 'aria2c'
+            self.ydl_opts['external_downloader_args'] = ['-x', '16', '-s', '16']
+
+    def _wait_for_turn(self, url: str) -> None:
+        """
+        Wait until another request to the URL's website is allowed
+
+        Args:
+            url: URL about to be requested
+        """
+        host = urlparse(url if '://' in url else 'https://' + url).netloc.lower()
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = TokenBucket(self.requests_per_second)
+                self._limiters[host] = limiter
+        limiter.acquire()
+
+    @contextmanager
+    def _open_queue(self):
+        """
+        Open the download queue database (use in a `with` block - changes are
+        committed and the connection closed at the end)
+        """
+        db = sqlite3.connect(self._queue_path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _queue_add(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Add URLs to the download queue
+
+        Args:
+            urls: Video URLs of a batch
+
+        Returns:
+            {url: path} for the URLs that are already done (and whose file still exists)
+        """
+        with self._open_queue() as db:
+            db.executemany("INSERT OR IGNORE INTO q (url, state, path, attempts) "
+                           "VALUES (?, 'PENDING', NULL, 0)", [(url,) for url in urls])
+            rows = db.execute("SELECT url, path FROM q WHERE state = 'DONE'").fetchall()
+        wanted = set(urls)
+        return {url: path for url, path in rows
+                if url in wanted and path and os.path.exists(path)}
+
+    def _queue_mark(self, url: str, path: str) -> None:
+        """
+        Record how a queued download ended
+
+        Args:
+            url: Video URL
+            path: Downloaded file, or None if the download failed
+        """
+        with self._open_queue() as db:
+            if path:
+                db.execute("UPDATE q SET state = 'DONE', path = ?, attempts = attempts + 1 "
+                           "WHERE url = ?", (path, url))
+            else:
+                db.execute("UPDATE q SET state = 'FAILED', attempts = attempts + 1 "
+                           "WHERE url = ?", (url,))
+
+    def _meta_cache_path(self, url: str) -> str:
+        """Cache file for a URL's video info"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.meta_cache_dir, f"{key}.json")
+
+    def _load_info(self, url: str, max_age: float = META_CACHE_TTL) -> Dict:
+        """
+        Read a URL's video info from the disk cache
+
+        Args:
+            url: YouTube video URL
+            max_age: Ignore cached info older than this (seconds, None = any age)
+
+        Returns:
+            Video info dictionary, or None if not cached (or too old)
+        """
+        try:
+            with open(self._meta_cache_path(url), 'r') as f:
+                cached = json.load(f)
+            if max_age is None or time.time() - cached['time'] < max_age:
+                return cached['info']
+        except (OSError, ValueError, KeyError):
+            pass  # Not cached yet (or unreadable)
+        return None
+
+    def _save_info(self, url: str, info: Dict) -> None:
+        """
+        Write a URL's video info to the disk cache
+
+        Args:
+            url: YouTube video URL
+            info: Sanitized video info dictionary
+        """
+        cache_path = self._meta_cache_path(url)
+
+        # Write to a temporary file first, so parallel downloads never see half a file
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'time': time.time(), 'info': info}, f)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _get_info(self, ydl, url: str) -> Dict:
+        """
+        Get video info, from the disk cache if it is fresh enough
+
+        Args:
+            ydl: Open YoutubeDL object
+            url: YouTube video URL
+
+        Returns:
+            Video info dictionary
+        """
+        info = self._load_info(url)
+        if info is not None:
+            return info
+
+        self._wait_for_turn(url)
+        info = ydl.extract_info(url, download=False)
+        if info is None:
+            # yt-dlp skipped it because it is listed in the download archive
+            _say(f"⏭️  Already in download archive: {url}")
+            return None
+
+        info = ydl.sanitize_info(info)
+        self._save_info(url, info)
+        return info
+
+    def download_video(self, url: str, ydl=None) -> str:
         """
         Download a single video from URL
 
         Args:
             url: YouTube video URL
+            ydl: Open YoutubeDL object to reuse (optional - a new one is
+                created just for this video if not given)
 
         Returns:
             Path to downloaded video file
         """
-        try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                # Get video info first
-                info = ydl.extract_info(url, download=False)
-                filename = ydl.prepare_filename(info)
+        return self._download(url, ydl)
+
+    def _download(self, url: str, ydl=None, info: Dict = None) -> str:
+        """
+        Download a single video, optionally from info looked up earlier
+
+        Args:
+            url: YouTube video URL
+            ydl: Open YoutubeDL object to reuse (optional)
+            info: Video info from _look_up (optional - without it the video is
+                looked up and downloaded in one go)
+
+        Returns:
+            Path to downloaded video file, or None if the download failed
+        """
+        if ydl is None:
+            # Each call gets its own options and YoutubeDL, so downloads can
+            # run in parallel threads (a YoutubeDL object is not thread-safe)
+            try:
+                with yt_dlp.YoutubeDL(dict(self.ydl_opts)) as one_shot:
+                    return self._download(url, one_shot, info)
+            except Exception as e:
+                _say(f"❌ Error downloading {url}: {str(e)}")
+                return None
 
-                # Download the video
-                ydl.download([url])
+        # Worked out once, not again on every retry (_look_up already did it)
+        if info is None:
+            try:
+                downloaded = self._already_downloaded(ydl, url)
+            except Exception as e:
+                _say(f"❌ Error downloading {url}: {str(e)}")
+                return None
+            if downloaded is not None:
+                return downloaded
 
-                print(f"✅ Downloaded: {info['title']}")
-                return filename
+        # Retries look the video up again, in case its download links went stale
+        return self._with_retries(
+            url, lambda attempt: self._download_with(ydl, url, info if attempt == 0 else None))
+
+    def _look_up(self, url: str, ydl):
+        """
+        Get a video's info without downloading it - the first step of download_multiple
+
+        Args:
+            url: YouTube video URL
+            ydl: Open YoutubeDL object
 
+        Returns:
+            (downloaded, info) - downloaded is the file's path if the video was
+            downloaded on an earlier run, info the video info otherwise (both
+            None if the lookup failed)
+        """
+        try:
+            downloaded = self._already_downloaded(ydl, url)
         except Exception as e:
-            print(f"❌ Error downloading {url}: {str(e)}")
+            _say(f"❌ Error downloading {url}: {str(e)}")
+            return None, None
+        if downloaded is not None:
+            return downloaded, None
+        return None, self._with_retries(url, lambda attempt: self._get_info(ydl, url))
+
+    def _with_retries(self, url: str, action):
+        """
+        Run action(attempt) until it works, waiting longer after each failure
+        (errors that would only happen again are not retried)
+
+        Args:
+            url: YouTube video URL (for messages)
+            action: Function doing the work, given the attempt number (0, 1, ...)
+
+        Returns:
+            What action returned, or None if every attempt failed
+        """
+        for attempt in range(DOWNLOAD_ATTEMPTS):
+            try:
+                return action(attempt)
+
+            except (yt_dlp.utils.DownloadError, yt_dlp.utils.ExtractorError) as e:
+                if attempt == DOWNLOAD_ATTEMPTS - 1 or _is_permanent(e):
+                    _say(f"❌ Error downloading {url}: {str(e)}")
+                    return None
+                # Wait longer after each failure (plus a random bit, so parallel
+                # downloads don't all retry at the same moment)
+                wait_time = 2 ** attempt + random.random()
+                _say(f"🔁 Retrying {url} in {wait_time:.0f}s (attempt {attempt + 2}/{DOWNLOAD_ATTEMPTS})")
+                time.sleep(wait_time)
+
+            except Exception as e:
+                _say(f"❌ Error downloading {url}: {str(e)}")
+                return None
+
+    def _already_downloaded(self, ydl, url: str):
+        """
+        Check if a video was downloaded on an earlier run
+
+        Cached info of any age is good enough to know the file name (checked
+        here as well as by the download archive, so files from before the
+        archive existed count too).
+
+        Args:
+            ydl: Open YoutubeDL object
+            url: YouTube video URL
+
+        Returns:
+            Path to the downloaded video file, or None if not downloaded yet
+        """
+        cached = self._load_info(url, max_age=None)
+        if cached is None:
+            return None
+        filename = ydl.prepare_filename(cached)
+        if not os.path.exists(filename):
+            return None
+        _say(f"⏭️  Already downloaded: {cached['title']}")
+        return filename
+
+    def _download_with(self, ydl, url: str, info: Dict = None):
+        """
+        Download a single video with an open YoutubeDL object
+
+        Args:
+            ydl: Open YoutubeDL object
+            url: YouTube video URL
+            info: Video info looked up earlier (optional)
+
+        Returns:
+            Path to downloaded video file, or None if yt-dlp skipped the video
+        """
+        self._wait_for_turn(url)
+        if info is not None:
+            # Download straight from the info we already have
+            info = ydl.process_ie_result(info, download=True)
+        else:
+            # Get the video info and download it in one go (a separate info
+            # lookup first would make yt-dlp do all of its extraction work twice)
+            info = ydl.extract_info(url, download=True)
+        if info is None:
+            # yt-dlp skipped it because it is listed in the download archive
+            _say(f"⏭️  Already in download archive: {url}")
             return None
 
-    def download_multiple(self, urls: List[str]) -> List[str]:
+        info = ydl.sanitize_info(info)
+        self._save_info(url, info)
+        filename = ydl.prepare_filename(info)
+
+        _say(f"✅ Downloaded: {info['title']}")
+        return filename
+
+    def download_multiple(self, urls: List[str], max_workers: int = MAX_PARALLEL_DOWNLOADS) -> List[str]:
         """
-        Download multiple videos
+        Download multiple videos, several at a time
 
         Args:
             urls: List of YouTube video URLs
+            max_workers: How many videos to download at the same time
 
         Returns:
-            List of paths to downloaded video files
+            List of paths to downloaded video files (in the same order as urls,
+            duplicates left out)
         """
-        downloaded_files = []
+        # Each video only once, even if it is listed twice or written differently
+        unique = {}
+        for url in urls:
+            key = _canon(url)
+            if key in unique:
+                _say(f"⏭️  Skipping duplicate: {url}")
+            else:
+                unique[key] = url.strip()
+        urls = list(unique.values())
 
+        if not urls:
+            return []
+
+        # Videos finished on an earlier run of this batch are not fetched again
+        results = {}
+        done = self._queue_add(urls)
         for i, url in enumerate(urls, 1):
-            print(f"\n📥 Downloading video {i}/{len(urls)}: {url}")
-            filename = self.download_video(url)
-            if filename:
-                downloaded_files.append(filename)
+            if url in done:
+                _say(f"⏭️  Already done in an earlier run: {url}")
+                results[i] = done[url]
+
+        # Each worker thread opens one YoutubeDL and reuses it for all of its
+        # videos, keeping its connections and extractor setup between videos.
+        # They are all closed together when the batch is done.
+        local = threading.local()
+        lock = threading.Lock()
+
+        # One progress bar for the batch, showing the combined download speed
+        # of all workers (reported by yt-dlp's progress hooks)
+        progress = None
+        if TQDM_AVAILABLE:
+            progress = tqdm(total=len(urls), initial=len(done), unit='video', desc='📥 Downloading')
+        speeds = {}
+        last_refresh = [0.0]
+
+        def progress_hook(d: Dict) -> None:
+            with lock:
+                if d['status'] == 'downloading':
+                    speeds[d.get('filename')] = d.get('speed') or 0
+                else:
+                    speeds.pop(d.get('filename'), None)
+                now = time.monotonic()
+                if now - last_refresh[0] < 0.5:
+                    return
+                last_refresh[0] = now
+                total_speed = sum(speeds.values())
+            progress.set_postfix_str(f"{total_speed / 1e6:.1f} MB/s")
+
+        def video_finished(i: int, path: str) -> None:
+            results[i] = path
+            self._queue_mark(urls[i - 1], path)
+            if progress is not None:
+                progress.update(1)
+
+        with ExitStack() as open_ydls:
+            if progress is not None:
+                open_ydls.enter_context(progress)
+
+            def worker_ydl():
+                ydl = getattr(local, 'ydl', None)
+                if ydl is None:
+                    options = dict(self.ydl_opts)
+                    if progress is not None:
+                        options['progress_hooks'] = [progress_hook]
+                    ydl = yt_dlp.YoutubeDL(options)
+                    with lock:
+                        open_ydls.enter_context(ydl)
+                    local.ydl = ydl
+                return ydl
+
+            def look_up_in_worker(url: str):
+                return self._look_up(url, worker_ydl())
+
+            def download_in_worker(url: str, info: Dict):
+                return self._download(url, worker_ydl(), info)
+
+            # Each video goes through two pools: lookup (many at a time -
+            # mostly waiting for YouTube) and download. A video moves on as
+            # soon as its lookup is done, so a slow lookup never holds up
+            # downloading the videos that are ready.
+            with ThreadPoolExecutor(max_workers=min(len(urls), MAX_PARALLEL_LOOKUPS)) as lookups, \
+                    ThreadPoolExecutor(max_workers=min(len(urls), max(1, max_workers))) as downloads:
+                running = {}
+                for i, url in enumerate(urls, 1):
+                    if i in results:
+                        continue
+                    if progress is None:
+                        print(f"\n📥 Downloading video {i}/{len(urls)}: {url}")
+                    running[lookups.submit(look_up_in_worker, url)] = ('lookup', i)
+
+                while running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        step, i = running.pop(future)
+                        url = urls[i - 1]
+                        if step == 'lookup':
+                            downloaded, info = future.result()
+                            if info is not None:
+                                running[downloads.submit(download_in_worker, url, info)] = ('download', i)
+                            else:
+                                video_finished(i, downloaded)
+                        else:
+                            video_finished(i, future.result())
 
-        return downloaded_files
+        return [results[i] for i in sorted(results) if results[i]]
 
 
 def main():
     """Download test videos for parking lot monitoring"""
+    parser = argparse.ArgumentParser(description="Download parking lot test videos")
+    parser.add_argument("urls", nargs="*", help="Video URLs (default: the built-in test videos)")
+    parser.add_argument("--from-file", type=argparse.FileType("r"),
+                        help="Text file with one URL per line ('-' reads from stdin)")
+    parser.add_argument("--jobs", type=int, default=MAX_PARALLEL_DOWNLOADS,
+                        help=f"Videos to download at the same time (default: {MAX_PARALLEL_DOWNLOADS})")
+    args = parser.parse_args()
 
-    # List of parking lot video URLs for testing
-    test_videos = [
-        "https://www.youtube.com/watch?v=MeSeuzBhq2E",  # Original tutorial video
-        "https://www.youtube.com/watch?v=caKnQlCMIeI",  # Parking lot surveillance
-        "https://www.youtube.com/watch?v=1E_UHOpUwOQ",  # Mall parking lot
-    ]
+    test_videos = list(args.urls)
+    if args.from_file:
+        with args.from_file:
+            for line in args.from_file:
+                line = line.strip()
+                if line and not line.startswith('#'):  # Skip blank lines and comments
+                    test_videos.append(line)
+    if not test_videos:
+        test_videos = TEST_VIDEOS
 
     print("🚗 Parking Lot Video Downloader")
     print("=" * 40)
@@ -93,7 +677,7 @@ def main():
     print(f"🎥 Videos to download: {len(test_videos)}")
 
     # Download videos
-    downloaded = downloader.download_multiple(test_videos)
+    downloaded = downloader.download_multiple(test_videos, max_workers=max(1, args.jobs))
 
     print(f"\n✨ Download complete!")
     print(f"📊 Successfully downloaded: {len(downloaded)}/{len(test_videos)} videos")